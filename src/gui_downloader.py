@@ -10,11 +10,18 @@ As usual, it requires the following packages:
 
 import sys
 import os
-import time
-from pathlib import Path
+import random
+import re
+import subprocess
+import threading
+import collections
+import functools
+import concurrent.futures
 from datetime import datetime
-from interactive_downloader import Downloader # Downloader class
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer, QSettings # For core non GUI Components
+from urllib.parse import urlsplit
+from interactive_downloader import Downloader, MetadataCache, spotify_id # Downloader class
+from PyQt5.QtCore import (Qt, QThread, pyqtSignal, QTimer, QSettings, QObject,
+                          QRunnable, QThreadPool, QMutex, QMutexLocker) # For core non GUI Components
 from PyQt5.QtGui import QFont, QPalette, QColor # For GUI's components  
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                              QHBoxLayout, QPushButton, QLabel, QLineEdit, QTextEdit,
@@ -24,60 +31,120 @@ from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
 
 """CONFIG (Subject to change)"""
 MAX_RETRIES = 5
-RETRY_DELAY = 30
+RETRY_DELAY = 30 # Longest wait between retries
+BASE_DELAY = 1.0 # First retry waits about this long, doubling every attempt after
+JITTER = 0.5 # Up to 50% extra random wait so workers don't retry in lockstep
+MAX_WORKERS = min(32, (os.cpu_count() or 1) * 2) # No of batch urls downloaded at the same time
+SINGLE_WORKERS = min(32, (os.cpu_count() or 1) + 4) # Threads kept for single downloads (ThreadPoolExecutor's default)
+LOG_QUEUE_MAX = 5000 # Console messages kept between flushes, the oldest are dropped past this
 
-class DownloadThread(QThread):
-    """ """
+def backoff_delay(attempt, base_delay=BASE_DELAY, max_delay=RETRY_DELAY, jitter=JITTER):
+    """ Exponential backoff with jitter for the given (1-based) attempt"""
+    return min(max_delay, base_delay * (2 ** (attempt - 1)) * (1 + random.uniform(0, jitter)))
+
+def _iter_urls(path):
+    """ Stream urls from a batch file, skipping blank lines and # comments"""
+    with open(path, 'r', buffering=1 << 16) as file:
+        for raw in file:
+            line = raw.strip()
+            if line and not line.startswith('#'):
+                yield line
+
+def _unique(urls):
+    """ Drop repeated urls (same Spotify ID, e.g. differing ?si= links), keeping first-seen order"""
+    seen = set()
+    for url in urls:
+        key = spotify_id(url) or url
+        if key not in seen:
+            seen.add(key)
+            yield url
+
+def _classify(url):
+    """ Url type from its path ('/album/<id>', 'spotify:album:<id>'), anything unknown is a track
+    The kind is found wherever it is in the path, e.g. after /intl-de/ or the legacy /user/<name>/"""
+    segments = re.split(r'[/:]', urlsplit(url).path)
+    i = 0
+    while i < len(segments) - 1:
+        if segments[i] == "user": # Skip the user name, it could be "album" too
+            i += 2
+            continue
+        if segments[i] in ("album", "playlist", "track") and segments[i + 1]:
+            return segments[i]
+        i += 1
+    return "track"
+
+def _template_lookup(templates):
+    """ Memoized url -> (output_template, additional_args) for one batch's templates"""
+    @functools.lru_cache(maxsize=8192)
+    def template_for(url):
+        return templates[_classify(url)]
+    return template_for
+
+class DownloadWorker(QObject):
+    """ A single download, run() is submitted to the GUI's executor
+    The QObject only carries the signals back to the GUI thread"""
     update_signal = pyqtSignal(str) # Handles console messages
     progress_signal = pyqtSignal(str) # Updates GUI progress bar
     finished_signal = pyqtSignal(bool, str) # Enable buttons, show result
     
-    def __init__(self, downloader, url, download_type, output_dir, bitrate, audio_format):
+    def __init__(self, downloader, url, download_type, output_dir, bitrate, audio_format, metadata_cache=None):
         super().__init__()
+        self.future = None # Set once submitted
         self.downloader = downloader
+        self.metadata_cache = metadata_cache
         self.url = url
         self.download_type = download_type
         self.output_dir = output_dir
         self.bitrate = bitrate
         self.audio_format = audio_format
+        self._stop_event = threading.Event() # Set to cancel the running spotdl process
+        # Full output templates, joined once rather than per download branch
+        base = os.fspath(output_dir)
+        self._tpl_album = os.path.join(base, "{artist}", "{album}", "{title}.{output-ext}")
+        self._tpl_playlist = os.path.join(base, "{playlist}", "{title}.{output-ext}")
+        self._tpl_track = os.path.join(base, "{title}.{output-ext}")
         
     def run(self):
+        # spotdl's output is streamed to the console as it downloads
+        stream = {"on_output": self.update_signal.emit, "cancel_event": self._stop_event}
         try:
             # Configure downloader with GUI settings
-            self.downloader._Downloader__bitrate = self.bitrate
-            self.downloader._Downloader__audio_format = self.audio_format
-            self.downloader._Downloader__output_dir = Path(self.output_dir)
+            self.downloader.configure(self.bitrate, self.audio_format, os.fspath(self.output_dir))
             
             # Detect a link
             self.update_signal.emit(f"Starting download...\n URL: {self.url}")
             
+            # Reuse metadata spotdl already resolved for this url (searches aren't cached)
+            query = self.url
+            if self.metadata_cache and self.download_type != "search":
+                query = self.metadata_cache.get(self.url, self._stop_event)
+            
             # Self-determine which download method to use based on type
             
             # Download track
             if self.download_type == "track":
-                output_template = str(Path(self.output_dir) / "{title}.{output-ext}")
                 result = self.downloader.run_download(
-                    self.url,
-                    output_template)
+                    query,
+                    self._tpl_track,
+                    **stream)
             
             # Download album
             elif self.download_type == "album":
-                output_template = str(Path(self.output_dir) / "{artist}/{album}/{title}.{output-ext}")
                 result = self.downloader.run_download(
-                    self.url,
-                    output_template)
+                    query,
+                    self._tpl_album,
+                    **stream)
             
             # Download playlist                
             elif self.download_type == "playlist":
-                output_template = str(self.__output_dir / "{playlist}/{title}.{output-ext}")
                 result = self.downloader.run_download(
-                    self.url,
-                    output_template,
-                    ["--playlist-numbering", "--playlist-retaining"])
+                    query,
+                    self._tpl_playlist,
+                    ["--playlist-numbering", "--playlist-retaining"],
+                    **stream)
                 
             elif self.download_type == "search":
-                output_template = str(Path(self.output_dir) / "{title}.{output-ext} ")
-                result = self.downloader.run_download(self.url, output_template)
+                result = self.downloader.run_download(self.url, self._tpl_track, **stream)
             
             elif self.download_type == "file":
                 self.update_signal.emit("Batch download from file selected. Use the 'Batch Download' tab. ")
@@ -102,106 +169,189 @@ class DownloadThread(QThread):
         except Exception as e:
             self.update_signal.emit(f"Error: {str(e)}")
             self.finished_signal.emit(False, str(e))
+            
+    def stop(self):
+        """ Cancel the download, spotdl is stopped and run() returns on its own"""
+        self._stop_event.set()
+
+class WorkerSignals(QObject):
+    """ Signals for a pooled download (QRunnable can't emit signals itself)"""
+    result = pyqtSignal(int, object) # (index, result)
+
+class DownloadRunnable(QRunnable):
+    """ Runs a single url from a batch on the GUI's thread pool"""
+    
+    def __init__(self, index, task, *args):
+        super().__init__()
+        self.index = index
+        self.task = task
+        self.args = args
+        self.signals = WorkerSignals()
+        
+    def run(self):
+        try:
+            result = self.task(*self.args)
+        except Exception as e:
+            result = e
+        self.signals.result.emit(self.index, result)
 
 class BatchDownloadThread(QThread):
-    """ Download a file containing spotify album""" 
+    """ Download a file containing spotify album
+    Hands each url to the thread pool and waits for the pool to drain""" 
     
     update_signal = pyqtSignal(str, str) # (message, type)
     progress_signal = pyqtSignal(int, int) # (current, total)
     finished_signal = pyqtSignal(int, int) # (successful, total)
     
-    def __init__(self, downloader, filepath, output_dir, bitrate, audio_format, max_retries, retry_delay):
+    def __init__(self, downloader, thread_pool, filepath, output_dir, bitrate, audio_format, max_retries, retry_delay,
+                 metadata_cache=None):
         super().__init__()
         self.downloader = downloader
+        self.thread_pool = thread_pool
+        self.metadata_cache = metadata_cache
         self.filepath = filepath
         self.output_dir = output_dir
         self.bitrate = bitrate
         self.audio_format = audio_format
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self._stop_event = threading.Event() # Set to abandon the batch, also cuts retry waits short
+        
+        # Output templates only depend on the output directory, build them once per batch
+        self._out = os.fspath(output_dir)
+        self._tpl_album = os.path.join(self._out, "{artist}", "{album}", "{title}.{output-ext}")
+        self._tpl_playlist = os.path.join(self._out, "{playlist}", "{title}.{output-ext}")
+        self._tpl_track = os.path.join(self._out, "{title}.{output-ext}")
+        self._template_for = _template_lookup({
+            "album": (self._tpl_album, None),
+            "playlist": (self._tpl_playlist, ("--playlist-numbering", "--playlist-retain-track-cover")),
+            "track": (self._tpl_track, None),
+        })
+        self._mutex = QMutex() # Guards the counters below, results arrive from the pool's threads
+        self._completed = 0
+        self._success = 0
+        self._total = 0
         
     def run(self):
-        # Configure downloader
-        self.downloader._Downloader__bitrate = self.bitrate
-        self.downloader._Downloader__audio_format = self.audio_format
-        self.downloader._Downloader__output_dir = Path(self.output_dir)
+        # Configure downloader once for the whole batch
+        self.downloader.configure(self.bitrate, self.audio_format, self._out)
         
-        # Reading URLs from the file
+        # Count the URLs up front for the progress bar, they are streamed again below
         try:
-            with open(self.filepath, 'r') as file:
-                urls = [line.strip() for line in file if line.strip() and not line.strip().startswith('#')]
+            lines = 0
+            seen = set()
+            for url in _iter_urls(self.filepath):
+                lines += 1
+                seen.add(spotify_id(url) or url)
+            self._total = len(seen)
         except Exception as e:
-            self.update_signal.emit(f"Couldn't read the file: {(str(e))}")
+            self.update_signal.emit(f"Couldn't read the file: {(str(e))}", "error")
             self.finished_signal.emit(0, 0)
             return
 
-        if not urls:
+        if not self._total:
             self.update_signal.emit("No URLs in the file", "warning")
             self.finished_signal.emit(0, 0)
             return
         
-        total = len(urls)
-        success = 0
+        if lines > self._total:
+            self.update_signal.emit(f"Skipping {lines - self._total} duplicate URL(s)", "info")
+        
+        self._completed = 0
+        self._success = 0
         
-        for i, url in enumerate(urls, 1):
-            self.progress_signal.emit(i, total)
-            self.update_signal.emit(f"Processing {i}/{total}: {url}", "info")
+        # Urls are handed to the pool as they are read
+        for i, url in enumerate(_unique(_iter_urls(self.filepath)), 1):
+            if self._stop_event.is_set():
+                break
+            self.update_signal.emit(f"Queued {i}/{self._total}: {url}", "info")
             
             # Download based on URL type
-            # Download album
-            if "album" in url.lower():
-                output_template = str(Path(self.output_dir) / "{artist}/{album}/{title}.{output-ext}")
-                additional_args = None
-                
-            # Download playlist                
-            elif "playlist" in url.lower():
-                output_template = str(self.__output_dir / "{playlist}/{title}.{output-ext}")
-                additional_args = ["--playlist-numbering", "--playlist-retain-track-cover"]
+            output_template, additional_args = self._template_for(url)
             
-            # If it is a track
-            else:
-                output_template = str(Path(self.output_dir) / "{title}.{output-ext}")
-                additional_args = None
+            runnable = DownloadRunnable(i, self.download_url, url, output_template, additional_args)
+            # Direct connection: count in the pool thread so the totals are final once the pool drains
+            runnable.signals.result.connect(self.on_result, Qt.DirectConnection)
+            self.thread_pool.start(runnable)
             
-            for attempt in range(1, MAX_RETRIES + 1):
-                self.update_signal.emit(f"Download Attempt {attempt}/{MAX_RETRIES}", "info")
-                
-                try:
-                    result = self.downloader.run_download(url, output_template, additional_args)
-                        
-                    # Check returncodes from Interactive Downloader
-                    if hasattr(result, 'returncode'):
-                        if result.returncode == 0: # Successful download
-                            success += 1
-                            self.update_signal.emit("Download Completed")
-                            break
-                            
-                        elif result.returncode == 100: # Error in the metadata type
-                            self.update_signal.emit("Error: Metadata TypeError")
-                            break
+        self.thread_pool.waitForDone()
+        self.finished_signal.emit(self._success, self._total)
+        
+    def download_url(self, url, output_template, additional_args):
+        """ Download a single url with retries, returns True on success"""
+        # Cached metadata is used when there is some, retries save it so they don't look the url up again
+        query = self.metadata_cache.get(url, self._stop_event) if self.metadata_cache else url
+        # So is the spotdl command
+        argv = self.downloader.build_argv(query, output_template, additional_args)
+        
+        for attempt in range(1, self.max_retries + 1):
+            if self._stop_event.is_set():
+                break
+            if attempt > 1 and query == url and self.metadata_cache:
+                query = self.metadata_cache.get(url, self._stop_event, save=True)
+                argv = self.downloader.build_argv(query, output_template, additional_args)
+            self.update_signal.emit(f"Download Attempt {attempt}/{self.max_retries}: {url}", "info")
+            
+            try:
+                result = self.downloader.run_download(
+                    query, output_template, additional_args, argv=argv,
+                    on_output=lambda line: self.update_signal.emit(line, "info"),
+                    cancel_event=self._stop_event)
+                    
+                # Check returncodes from Interactive Downloader
+                if hasattr(result, 'returncode'):
+                    if result.returncode == 0: # Successful download
+                        self.update_signal.emit(f"Download Completed: {url}", "success")
+                        return True
                         
-                        elif result.returncode == 101: # Error finding a song during search
-                            self.update_signal.emit("Error: Lookup Error")
-                            break
+                    elif result.returncode == 100: # Error in the metadata type
+                        self.update_signal.emit(f"Error: Metadata TypeError: {url}", "error")
+                        return False
                     
-                    if attempt < MAX_RETRIES:
-                        time.sleep(RETRY_DELAY)
-                    else:
-                        self.update_signal.emit(f"Download Failed after {MAX_RETRIES} attempts") # Failed download 
-                        self.finished_signal.emit(False, "Download failed")
+                    elif result.returncode == 101: # Error finding a song during search
+                        self.update_signal.emit(f"Error: Lookup Error: {url}", "error")
+                        return False
                 
-                except Exception as e:
-                    self.update_signal.emit(f"Exception: {str(e)}", "error")
-                    if attempt == MAX_RETRIES:
-                        break
-                    time.sleep(RETRY_DELAY)
-                    
-        self.finished_signal.emit(success, total)
+                if attempt == self.max_retries:
+                    # Only this url failed, the batch carries on; finished_signal is reserved for the end of run()
+                    self.update_signal.emit(f"Download Failed after {self.max_retries} attempts: {url}", "error")
+                    break
+            
+            except Exception as e:
+                self.update_signal.emit(f"Exception: {str(e)}", "error")
+                if attempt == self.max_retries:
+                    break
+            
+            # No point waiting after the final attempt, wakes early if the batch is stopped
+            if self._stop_event.wait(backoff_delay(attempt, max_delay=self.retry_delay)):
+                break
+        return False
+    
+    def stop(self):
+        """ Stop dispatching urls and retrying, running spotdl processes are cancelled too"""
+        self._stop_event.set()
+    
+    def on_result(self, index, result):
+        """ Collect a finished url from the pool"""
+        with QMutexLocker(self._mutex):
+            self._completed += 1
+            if result is True:
+                self._success += 1
+            completed = self._completed
+        self.progress_signal.emit(completed, self._total)
         
 class DownloaderGUI(QMainWindow):
     def __init__(self):
         super().__init__()
         self.downloader = Downloader()
-        self.download_thread = None
+        self.download_worker = None
         self.batch_thread = None
+        # Single downloads reuse these threads instead of starting one per click
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=SINGLE_WORKERS)
+        # Kept alive across batches so worker threads are reused
+        self.thread_pool = QThreadPool()
+        self.thread_pool.setMaxThreadCount(MAX_WORKERS)
+        self.metadata_cache = MetadataCache(self.downloader)
         self.init_gui()
         
     # Defining the main window (subject to change)
@@ -234,6 +384,15 @@ class DownloaderGUI(QMainWindow):
         self.progress_bar = QProgressBar()
         self.progress_bar.setVisible(False)
         main_layout.addWidget(self.progress_bar)
+        
+        # Console messages are queued by the download threads and written out 10 times a second
+        self._log_queue = collections.deque(maxlen=LOG_QUEUE_MAX) # (widget, message, separator)
+        self._log_lock = threading.Lock() # Keeps the dropped count in step with the queue
+        self._log_dropped = 0 # Messages pushed out of the full queue since the last flush
+        self._log_timer = QTimer(self)
+        self._log_timer.setInterval(100)
+        self._log_timer.timeout.connect(self.flush_log_queue)
+        self._log_timer.start()
     
     # For the single tab (Subject to change)
     def single_download_tab(self, tabs):
@@ -415,22 +574,23 @@ class DownloaderGUI(QMainWindow):
         # Clear console
         self.console_output.clear()
         
-        # Start download thread
-        self.download_thread = DownloadThread(
+        # Start download worker
+        self.download_worker = DownloadWorker(
             self.downloader,
             url,
             download_type,
             output_dir,
             bitrate,
-            audio_format
+            audio_format,
+            self.metadata_cache
         )
         
-        # Connect signals
-        self.download_thread.update_signal.connect(self.update_console)
-        self.download_thread.finished_signal.connect(self.download_finished)
+        # Connect signals (update_console only queues, so it's called straight from the thread)
+        self.download_worker.update_signal.connect(self.update_console, Qt.DirectConnection)
+        self.download_worker.finished_signal.connect(self.download_finished)
         
-        # Start thread
-        self.download_thread.start()
+        # Run it on the executor
+        self.download_worker.future = self.executor.submit(self.download_worker.run)
         
     def start_batch_download(self):
         """Start batch download from file"""
@@ -463,16 +623,18 @@ class DownloaderGUI(QMainWindow):
         # Start batch download thread
         self.batch_thread = BatchDownloadThread(
             self.downloader,
+            self.thread_pool,
             file_path,
             output_dir,
             bitrate,
             audio_format,
             self.max_retries_spin.value(),
-            self.retry_delay_spin.value()
+            self.retry_delay_spin.value(),
+            self.metadata_cache
         )
         
         # Connect signals
-        self.batch_thread.update_signal.connect(self.update_batch_console)
+        self.batch_thread.update_signal.connect(self.update_batch_console, Qt.DirectConnection)
         self.batch_thread.progress_signal.connect(self.update_batch_progress)
         self.batch_thread.finished_signal.connect(self.batch_download_finished)
         
@@ -480,11 +642,11 @@ class DownloaderGUI(QMainWindow):
         self.batch_thread.start()
         
     def update_console(self, message):
-        """Update console with download messages"""
-        self.console_output.append(message)
+        """Queue a download message for the console (safe to call from any thread)"""
+        self._queue_log((self.console_output, message, "\n"))
         
     def update_batch_console(self, message, msg_type):
-        """Update batch console with colored messages"""
+        """Queue a colored message for the batch console (safe to call from any thread)"""
         color_map = {
             "info": "black",
             "success": "green",
@@ -493,11 +655,33 @@ class DownloaderGUI(QMainWindow):
         }
         
         color = color_map.get(msg_type, "black")
-        self.batch_console.append(f'<font color="{color}">{message}</font>')
-        # Auto-scroll to bottom
-        self.batch_console.verticalScrollBar().setValue(
-            self.batch_console.verticalScrollBar().maximum()
-        )
+        self._queue_log((self.batch_console, f'<font color="{color}">{message}</font>', "<br>"))
+        
+    def _queue_log(self, entry):
+        """Add a (widget, message, separator) to the queue, counting the oldest one if it's pushed out"""
+        with self._log_lock:
+            if len(self._log_queue) == LOG_QUEUE_MAX:
+                self._log_dropped += 1
+            self._log_queue.append(entry)
+        
+    def flush_log_queue(self):
+        """Write out queued console messages, one append per console"""
+        with self._log_lock:
+            if not self._log_queue:
+                return
+            entries, self._log_queue = self._log_queue, collections.deque(maxlen=LOG_QUEUE_MAX)
+            dropped, self._log_dropped = self._log_dropped, 0
+        
+        pending = {}
+        if dropped:
+            pending[self.console_output] = ("\n", [f"... {dropped} earlier messages dropped"])
+        for widget, message, separator in entries:
+            pending.setdefault(widget, (separator, []))[1].append(message)
+            
+        for widget, (separator, messages) in pending.items():
+            widget.append(separator.join(messages))
+            # Auto-scroll to bottom
+            widget.verticalScrollBar().setValue(widget.verticalScrollBar().maximum())
         
     def update_batch_progress(self, current, total):
         """Update batch progress bar"""
@@ -507,6 +691,7 @@ class DownloaderGUI(QMainWindow):
         
     def download_finished(self, success, message):
         """Handle completion of single download"""
+        self.flush_log_queue() # Keep the result after the thread's last messages
         self.download_button.setEnabled(True)
         self.download_button.setText("Start Download")
         self.progress_bar.setVisible(False)
@@ -520,6 +705,7 @@ class DownloaderGUI(QMainWindow):
             
     def batch_download_finished(self, success_count, total_count):
         """Handle completion of batch download"""
+        self.flush_log_queue()
         self.batch_download_button.setEnabled(True)
         self.batch_download_button.setText("Start Batch Download")
         
@@ -539,7 +725,7 @@ class DownloaderGUI(QMainWindow):
     def check_spotdl_installation(self):
         """Check if spotdl is installed"""
         try:
-            if self.downloader.check_spotdl():
+            if self.downloader.check_spotdl(install=False):
                 QMessageBox.information(self, "spotdl Check", "spotdl is installed and ready!")
             else:
                 reply = QMessageBox.question(
@@ -555,9 +741,6 @@ class DownloaderGUI(QMainWindow):
             
     def install_spotdl(self):
         """Install spotdl"""
-        import subprocess
-        import sys
-        
         self.console_output.append("Installing spotdl...")
         
         try:
@@ -622,17 +805,15 @@ class DownloaderGUI(QMainWindow):
             self.console_output.append(f"Starting {download_type} download...")
             
             # Configure downloader
-            self.downloader._Downloader__bitrate = bitrate
-            self.downloader._Downloader__audio_format = audio_format
-            self.downloader._Downloader__output_dir = Path(output_dir)
+            self.downloader.configure(bitrate, audio_format, output_dir)
             
             # Call the appropriate method
             if download_type == "playlists":
-                success = self.downloader.download_user_playlist()
+                success = self.downloader.download_user_playlist(interactive=False)
             elif download_type == "liked":
-                success = self.downloader.download_user_liked_songs()
+                success = self.downloader.download_user_liked_songs(interactive=False)
             elif download_type == "albums":
-                success = self.downloader.download_user_saved_albums()
+                success = self.downloader.download_user_saved_albums(interactive=False)
                 
             if success:
                 self.console_output.append(f"✓ {download_type.capitalize()} downloaded successfully!")
@@ -689,15 +870,24 @@ class DownloaderGUI(QMainWindow):
     # Ends here                
     def closeEvent(self, event):
         """Handle window close event"""
-        # Stop any running threads
-        if self.download_thread and self.download_thread.isRunning():
-            self.download_thread.terminate()
-            self.download_thread.wait()
-            
-        if self.batch_thread and self.batch_thread.isRunning():
+        # Stop any running downloads
+        if self.download_worker:
+            self.download_worker.stop()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        
+        batch_running = self.batch_thread and self.batch_thread.isRunning()
+        if batch_running:
+            self.batch_thread.stop()
+        self.thread_pool.clear() # Drop urls that haven't started yet
+        self.downloader.close() # Stops spotdl, so the workers return promptly
+        
+        if self.download_worker and self.download_worker.future:
+            concurrent.futures.wait([self.download_worker.future], timeout=2)
+        if batch_running and not self.batch_thread.wait(2000): # Last resort
             self.batch_thread.terminate()
             self.batch_thread.wait()
             
+        self.metadata_cache.close()
         event.accept()        
 # Call the GUI Class
 def caller():
@@ -5,189 +5,615 @@ Requires: PyQt5 (install with pip install PyQt5)
 
 import sys
 import os
-from pathlib import Path
+import re
+import time
+import random
+import asyncio
+import threading
+import itertools
+import codecs
+import collections
+import concurrent.futures
+import html
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QPushButton, QLabel, QLineEdit, 
-                             QTextEdit, QComboBox, QFileDialog, QMessageBox,
+                             QTextEdit, QPlainTextEdit, QComboBox, QFileDialog, QMessageBox,
                              QTabWidget, QGroupBox, QProgressBar, QCheckBox,
                              QSpinBox, QDoubleSpinBox, QListWidget, QListWidgetItem,
                              QSplitter, QFrame, QSizePolicy)
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer
-from PyQt5.QtGui import QFont, QPalette, QColor
+from PyQt5.QtCore import (Qt, pyqtSignal, QTimer, QObject, QRunnable, QThreadPool,
+                          QFileSystemWatcher, QProcess)
+from PyQt5.QtGui import QFont, QPalette, QColor, QTextCursor
 
 # Import your Downloader class
-from interactive_downloader import Downloader
+from interactive_downloader import Downloader, MetadataCache, ResponseCache
 
+# Retry / rate limit settings
+BASE_DELAY = 1.0  # First retry waits about this long, doubling every attempt after
+JITTER = 1.0  # Up to this many extra random seconds so workers don't retry in lockstep
+RATE_LIMIT_WAIT = 60  # Seconds every download holds off after Spotify rate limits us
+MAX_RATE_LIMIT_WAITS = 5  # Rate limited attempts don't use up retries, but give up after this many
+LOG_TAIL_BYTES = 256 * 1024  # The log viewer shows the end of larger logs, "Load Full" reads all of it
+LOG_VIEWER_MAX_BLOCKS = 20000  # Lines the log viewer keeps as it's appended to, unless fully loaded
+LOG_BUFFER_MAX = 5000  # Console messages kept between flushes (what the consoles hold), the oldest are dropped
 
-class DownloadThread(QThread):
-    """Thread for running download operations without freezing the GUI"""
+# What spotdl/spotipy/yt-dlp print when rate limited, a bare "429" would also match titles and IDs
+_RATE_LIMITED = re.compile(
+    r'HTTP Error 429|status(?: code)?:? 429|returned 429|429 Too Many Requests|rate/request limit',
+    re.IGNORECASE)
+
+# URL kind -> (output template parts under the output directory, extra spotdl args), None is a single track
+_URL_KIND = re.compile(r'(playlist|album)', re.IGNORECASE)
+_TEMPLATES = {
+    'playlist': (("{playlist}", "{title}.{output-ext}"), ("--playlist-numbering", "--playlist-retain-track-cover")),
+    'album': (("{artist}", "{album}", "{title}.{output-ext}"), None),
+    None: (("{artist} - {title}.{output-ext}",), None),
+}
+
+# User download kind -> (Downloader method, label), "all" runs every one of them (see _download_all)
+_DL_DISPATCH = {
+    "playlists": ("download_user_playlist", "Playlists"),
+    "liked": ("download_user_liked_songs", "Liked Songs"),
+    "albums": ("download_user_saved_albums", "Saved Albums"),
+}
+_ALL_USER_LABEL = "All user content"
+
+# Batch console colour per message type, anything else is shown as info
+_COLOR_MAP = {"info": "black", "success": "green", "error": "red", "warning": "orange"}
+_escape = html.escape
+
+
+def url_kind(url):
+    """'playlist', 'album' or None (track) for a Spotify URL"""
+    m = _URL_KIND.search(url)
+    return m.group(1).lower() if m else None
+
+
+class TokenBucket:
+    """Shared rate limiter for the batch workers
+    Every download takes a token first, tokens refill at rate_per_minute / 60 per second"""
+    
+    def __init__(self, rate_per_minute, capacity=1):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+        
+    def acquire(self, cancel_event=None):
+        """Block until a token is available, returns False if cancel_event is set while waiting"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if now < self._blocked_until:
+                    wait = self._blocked_until - now
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                else:
+                    wait = (1 - self._tokens) / self.rate
+            if cancel_event is None:
+                time.sleep(wait)
+            elif cancel_event.wait(wait):
+                return False
+            
+    def penalize(self, seconds):
+        """Hold every worker off for a while (e.g. after an HTTP 429)"""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+
+
+def count_urls(filepath):
+    """Count the URL lines (not blank or # comments) by scanning raw bytes, without decoding or keeping them"""
+    urls = 0
+    with open(filepath, 'rb', buffering=1 << 20) as file:
+        for line in file:
+            line = line.strip()
+            if line and not line.startswith(b'#'):
+                urls += 1
+    return urls
+
+
+def make_output_dir(path):
+    """Create the output directory, what workers use when not given the window's ensure_output_dir"""
+    os.makedirs(path, exist_ok=True)
+
+
+def is_rate_limited(result):
+    """Whether spotdl failed because Spotify rate limited us"""
+    return _RATE_LIMITED.search(getattr(result, 'stderr', None) or "") is not None
+
+
+class DownloadSignals(QObject):
+    """Signals for DownloadWorker and UserDownloadWorker (QRunnable can't emit signals itself)"""
     update_signal = pyqtSignal(str)
     progress_signal = pyqtSignal(int)
     finished_signal = pyqtSignal(bool, str)
+
+
+class DownloadWorker(QRunnable):
+    """Runs a single download on a pool thread without freezing the GUI"""
     
-    def __init__(self, downloader, url, download_type, output_dir, bitrate, audio_format):
+    def __init__(self, downloader, url, download_type, output_dir, bitrate, audio_format, metadata_cache=None,
+                 ensure_dir=make_output_dir):
         super().__init__()
+        self.signals = DownloadSignals()
         self.downloader = downloader
+        self.ensure_dir = ensure_dir
+        self.metadata_cache = metadata_cache
         self.url = url
         self.download_type = download_type
         self.output_dir = output_dir
+        base = os.fspath(output_dir)
+        self._tpl_playlist = os.path.join(base, *_TEMPLATES['playlist'][0])
+        self._tpl_album = os.path.join(base, *_TEMPLATES['album'][0])
+        self._tpl_track = os.path.join(base, *_TEMPLATES[None][0])
         self.bitrate = bitrate
         self.audio_format = audio_format
+        self._stop_event = threading.Event()  # Set by request_stop to cancel spotdl
+        
+    def request_stop(self):
+        """Cancel the download, spotdl is terminated and run() returns on its own"""
+        self._stop_event.set()
         
     def run(self):
+        # spotdl's output is shown line by line while it runs
+        stream = {"on_output": self.signals.update_signal.emit, "cancel_event": self._stop_event}
         try:
+            # Filesystem work stays off the UI thread (slow or network drives)
+            self.ensure_dir(self.output_dir)
+            
             # Configure downloader with GUI settings
-            self.downloader._Downloader__bitrate = self.bitrate
-            self.downloader._Downloader__audio_format = self.audio_format
-            self.downloader._Downloader__output_dir = Path(self.output_dir)
+            self.downloader.configure(bitrate=self.bitrate, audio_format=self.audio_format, output_dir=self.output_dir)
+            
+            self.signals.update_signal.emit(f"Starting download...\nURL: {self.url}")
             
-            self.update_signal.emit(f"Starting download...\nURL: {self.url}")
+            # Reuse metadata spotdl already resolved for this URL (searches aren't cached)
+            query = self.url
+            if self.metadata_cache and self.download_type != "search":
+                query = self.metadata_cache.get(self.url, self._stop_event)
             
             # Determine which download method to use based on type
             if self.download_type == "track_album":
-                if "album" in self.url.lower():
-                    output_template = str(Path(self.output_dir) / "{artist}/{album}/{title}.{output-ext}")
-                else:
-                    output_template = str(Path(self.output_dir) / "{artist} - {title}.{output-ext}")
-                    
-                result = self.downloader.run_download(self.url, output_template)
+                output_template = self._tpl_album if url_kind(self.url) == 'album' else self._tpl_track
+                result = self.downloader.run_download(query, output_template, **stream)
                 
             elif self.download_type == "playlist":
-                output_template = str(Path(self.output_dir) / "{playlist}/{title}.{output-ext}")
-                result = self.downloader.run_download(
-                    self.url, 
-                    output_template,
-                    ["--playlist-numbering", "--playlist-retain-track-cover"]
-                )
+                result = self.downloader.run_download(query, self._tpl_playlist, _TEMPLATES['playlist'][1], **stream)
                 
             elif self.download_type == "search":
-                output_template = str(Path(self.output_dir) / "{artist} - {title}.{output-ext}")
-                result = self.downloader.run_download(self.url, output_template)
+                result = self.downloader.run_download(self.url, self._tpl_track, **stream)
                 
             elif self.download_type == "file":
                 # For file downloads, we'll handle this differently
-                self.update_signal.emit("Batch download from file selected. Use the 'Batch Download' tab.")
-                self.finished_signal.emit(False, "Use Batch Download tab for file downloads")
+                self.signals.update_signal.emit("Batch download from file selected. Use the 'Batch Download' tab.")
+                self.signals.finished_signal.emit(False, "Use Batch Download tab for file downloads")
                 return
                 
             # Check result
-            if hasattr(result, 'returncode'):
+            if self._stop_event.is_set():
+                self.signals.update_signal.emit("Download cancelled")
+                self.signals.finished_signal.emit(False, "Cancelled")
+            elif hasattr(result, 'returncode'):
                 if result.returncode == 100:  # Metadata TypeError
-                    self.update_signal.emit("Error: Metadata TypeError")
-                    self.finished_signal.emit(False, "Metadata TypeError")
+                    self.signals.update_signal.emit("Error: Metadata TypeError")
+                    self.signals.finished_signal.emit(False, "Metadata TypeError")
                 elif result.returncode == 101:  # No results found
-                    self.update_signal.emit("Error: No results found")
-                    self.finished_signal.emit(False, "No results found")
+                    self.signals.update_signal.emit("Error: No results found")
+                    self.signals.finished_signal.emit(False, "No results found")
                 elif result.returncode == 0:
-                    self.update_signal.emit("Download completed successfully!")
-                    self.finished_signal.emit(True, "Download successful")
+                    self.signals.update_signal.emit("Download completed successfully!")
+                    self.signals.finished_signal.emit(True, "Download successful")
+                else:
+                    self.signals.update_signal.emit(f"Download failed (spotdl exit code {result.returncode})")
+                    self.signals.finished_signal.emit(False, "Download failed")
             else:
-                self.update_signal.emit("Download failed")
-                self.finished_signal.emit(False, "Download failed")
+                self.signals.update_signal.emit("Download failed")
+                self.signals.finished_signal.emit(False, "Download failed")
                 
         except Exception as e:
-            self.update_signal.emit(f"Error: {str(e)}")
-            self.finished_signal.emit(False, str(e))
+            self.signals.update_signal.emit(f"Error: {str(e)}")
+            self.signals.finished_signal.emit(False, str(e))
+
+
+class UserDownloadWorker(QRunnable):
+    """Runs the authenticated user downloads (playlists, liked songs, saved albums) on a pool thread"""
+    
+    def __init__(self, downloader, kind, output_dir, ensure_dir=make_output_dir):
+        super().__init__()
+        self.signals = DownloadSignals()
+        self.downloader = downloader
+        self.ensure_dir = ensure_dir
+        self.kind = kind
+        self.output_dir = output_dir
+        self._stop_event = threading.Event()  # Set by request_stop to cancel spotdl
+        # spotdl's output is shown line by line while it runs, the settings come from configure()
+        # (no prompts, two of the downloads in _download_all run at once)
+        self._stream = {"on_output": self.signals.update_signal.emit, "cancel_event": self._stop_event,
+                        "interactive": False}
+        
+    def request_stop(self):
+        """Cancel the downloads, spotdl is terminated and run() returns on its own"""
+        self._stop_event.set()
+        
+    def run(self):
+        try:
+            self.ensure_dir(self.output_dir)
+            if self.kind == "all":
+                self.signals.update_signal.emit("Starting playlists, liked songs and saved albums downloads...")
+                success = self._download_all()
+            else:
+                method_name, label = _DL_DISPATCH[self.kind]
+                self.signals.update_signal.emit(f"Starting {label} download...")
+                success = getattr(self.downloader, method_name)(**self._stream)
+            self.signals.finished_signal.emit(bool(success), "")
+            
+        except Exception as e:
+            self.signals.finished_signal.emit(False, str(e))
+            
+    def _download_all(self):
+        """Run the three user downloads, the first one alone so only it authorizes with Spotify
+        (they'd all bind spotipy's redirect port and write the token cache at once), then the other
+        two at the same time with the cached token, or one after another if authorizing failed"""
+        kinds = list(_DL_DISPATCH.values())
+        success = self._download_user(*kinds[0])
+        if self._stop_event.is_set():
+            return False
+        workers = len(kinds) - 1 if success else 1
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as ex:
+            futs = [ex.submit(self._download_user, name, label) for name, label in kinds[1:]]
+            for fut in futs:
+                success = fut.result() and success
+        return success
+        
+    def _download_user(self, method_name, label):
+        """Run one user download for _download_all and report how it ended"""
+        if self._stop_event.is_set():
+            return False
+        try:
+            ok = bool(getattr(self.downloader, method_name)(**self._stream))
+        except Exception as e:
+            self.signals.update_signal.emit(f"✗ Error downloading {label}: {str(e)}")
+            return False
+        self.signals.update_signal.emit(f"✓ {label} downloaded" if ok else f"✗ Failed to download {label}")
+        return ok
+
 
+class ProbeSignals(QObject):
+    """Signals for SpotdlProbe (QRunnable can't emit signals itself)"""
+    result = pyqtSignal(bool)
 
-class BatchDownloadThread(QThread):
-    """Thread for batch downloads from file"""
+
+class SpotdlProbe(QRunnable):
+    """Runs the spotdl installation check on a pool thread so the window isn't blocked"""
+    
+    def __init__(self, downloader):
+        super().__init__()
+        self.downloader = downloader
+        self.signals = ProbeSignals()
+        
+    def run(self):
+        try:
+            ok = bool(self.downloader.check_spotdl(install=False))  # Installing is left to install_spotdl
+        except Exception:
+            ok = False
+        self.signals.result.emit(ok)
+
+
+class BatchDownloadSignals(QObject):
+    """Signals for BatchDownloadWorker"""
     update_signal = pyqtSignal(str, str)  # (message, type)
     progress_signal = pyqtSignal(int, int)  # (current, total)
     finished_signal = pyqtSignal(int, int)  # (success_count, total_count)
+    error_signal = pyqtSignal(str)  # The batch couldn't start, sent instead of finished_signal
+
+
+class BatchDownloadWorker(QRunnable):
+    """Batch downloads from file, run on a pool thread
+    Runs an asyncio event loop, every URL is a coroutine and a semaphore caps how many download at once"""
     
-    def __init__(self, downloader, filepath, output_dir, bitrate, audio_format, max_retries, retry_delay):
+    def __init__(self, downloader, filepath, output_dir, bitrate, audio_format, max_retries, retry_delay,
+                 max_workers=3, rate_per_minute=60, metadata_cache=None, cache_path=None, cache_mode="disabled",
+                 ensure_dir=make_output_dir):
         super().__init__()
+        self.signals = BatchDownloadSignals()
         self.downloader = downloader
+        self.ensure_dir = ensure_dir
+        self.metadata_cache = metadata_cache
+        self.cache_path = cache_path  # Batch results, see ResponseCache
+        self.cache_mode = cache_mode
         self.filepath = filepath
         self.output_dir = output_dir
+        # The output directory is constant for the batch, so the full templates are built once
+        base = os.fspath(output_dir)
+        self._tpl_playlist = os.path.join(base, *_TEMPLATES['playlist'][0])
+        self._tpl_album = os.path.join(base, *_TEMPLATES['album'][0])
+        self._tpl_track = os.path.join(base, *_TEMPLATES[None][0])
+        self._templates = {
+            'playlist': (self._tpl_playlist, _TEMPLATES['playlist'][1]),
+            'album': (self._tpl_album, None),
+            None: (self._tpl_track, None),
+        }
         self.bitrate = bitrate
         self.audio_format = audio_format
         self.max_retries = max_retries
-        self.retry_delay = retry_delay
-        
+        self.retry_delay = retry_delay  # Longest wait between retries
+        self.rate_per_minute = rate_per_minute
+        self.max_workers = max_workers  # URLs downloaded at the same time, kept small for Spotify's rate limits
+        self._success_count = 0
+        self._completed = 0
+        self._url_count = 0
+        self._stop_event = threading.Event()  # Set by request_stop, read from the worker threads
+        self._loop = None  # The running event loop, only read or set under _loop_lock
+        self._loop_lock = threading.Lock()
+        self._cancelled = None  # The same flag for the event loop, wakes retry waits early
+        
+    def request_stop(self):
+        """Stop the batch: no new URLs start and running spotdl processes are cancelled"""
+        self._stop_event.set()
+        # _main clears _loop under the lock before it returns, so a loop seen here isn't closed yet
+        with self._loop_lock:
+            if self._loop is not None:
+                try:
+                    self._loop.call_soon_threadsafe(self._cancelled.set)
+                except RuntimeError:
+                    pass  # Loop closed anyway, the worker is already finishing
+            
+    async def _wait_cancelled(self, delay):
+        """Sleep for delay seconds, returns True early if the batch is stopped"""
+        try:
+            await asyncio.wait_for(self._cancelled.wait(), delay)
+            return True
+        except asyncio.TimeoutError:
+            return False
+            
     def run(self):
-        from datetime import datetime
-        import time
-        
-        # Configure downloader
-        self.downloader._Downloader__bitrate = self.bitrate
-        self.downloader._Downloader__audio_format = self.audio_format
-        self.downloader._Downloader__output_dir = Path(self.output_dir)
-        
-        # Read URLs from file
+        # Filesystem work stays off the UI thread (slow or network drives)
+        # The batch file is checked first, a mistyped path shouldn't create any directories
+        # The progress bar counts the same URLs the summary does
         try:
-            with open(self.filepath, 'r') as file:
-                urls = [line.strip() for line in file if line.strip() and not line.strip().startswith('#')]
-        except Exception as e:
-            self.update_signal.emit(f"Error reading file: {str(e)}", "error")
-            self.finished_signal.emit(0, 0)
+            total = count_urls(self.filepath)
+        except OSError as e:
+            self.signals.error_signal.emit(f"Please select a valid text file.\n{str(e)}")  # Instead of finished_signal
             return
             
-        if not urls:
-            self.update_signal.emit("No URLs found in file", "warning")
-            self.finished_signal.emit(0, 0)
+        if not total:
+            self.signals.update_signal.emit("No URLs found in file", "warning")
+            self.signals.finished_signal.emit(0, 0)
             return
             
-        total = len(urls)
-        success_count = 0
-        
-        for i, url in enumerate(urls, 1):
-            self.progress_signal.emit(i, total)
-            self.update_signal.emit(f"Processing {i}/{total}: {url}", "info")
+        try:
+            self.ensure_dir(self.output_dir)
+        except OSError as e:
+            self.signals.update_signal.emit(f"Couldn't create the output directory: {str(e)}", "error")
+            self.signals.finished_signal.emit(0, 0)
+            return
             
-            # Determine template based on URL type
-            if "playlist" in url.lower():
-                output_template = str(Path(self.output_dir) / "{playlist}/{title}.{output-ext}")
-                additional_args = ["--playlist-numbering", "--playlist-retain-track-cover"]
-            elif "album" in url.lower():
-                output_template = str(Path(self.output_dir) / "{artist}/{album}/{title}.{output-ext}")
-                additional_args = None
-            else:
-                output_template = str(Path(self.output_dir) / "{artist} - {title}.{output-ext}")
-                additional_args = None
+        # Configure downloader
+        self.downloader.configure(bitrate=self.bitrate, audio_format=self.audio_format, output_dir=self.output_dir)
+        self.signals.progress_signal.emit(0, total)  # Sizes the progress bar before anything downloads
             
-            # Attempt download with retries
-            for attempt in range(1, self.max_retries + 1):
-                self.update_signal.emit(f"  Attempt {attempt}/{self.max_retries}", "info")
-                
-                try:
-                    result = self.downloader.run_download(url, output_template, additional_args)
-                    
-                    if hasattr(result, 'returncode'):
-                        if result.returncode == 0:
-                            success_count += 1
-                            self.update_signal.emit(f"  ✓ Successfully downloaded", "success")
-                            break
-                        elif result.returncode in [100, 101]:  # Non-retryable errors
-                            self.update_signal.emit(f"  ✗ Non-retryable error", "error")
+        self._success_count = 0
+        self._completed = 0
+        self._url_count = 0
+        self._bucket = TokenBucket(self.rate_per_minute, capacity=self.max_workers)
+        self.signals.update_signal.emit(f"Downloading {total} URLs, {self.max_workers} at a time", "info")
+        
+        try:
+            self._results = ResponseCache(self.cache_path, self.cache_mode)
+        except Exception as e:
+            self.signals.update_signal.emit(f"Couldn't open the results cache: {str(e)}", "error")
+            self.signals.finished_signal.emit(0, 0)
+            return
+        try:
+            asyncio.run(self._main(total))
+        finally:
+            self._results.close()
+        if self._stop_event.is_set():
+            self.signals.update_signal.emit("Batch cancelled", "warning")
+        elif not self._url_count:
+            self.signals.update_signal.emit("No URLs found in file", "warning")
+        
+        self.signals.finished_signal.emit(self._success_count, self._url_count)
+        
+    async def _main(self, total):
+        """Download every URL, at most max_workers at a time
+        URLs are read from the file into a bounded queue as consumers free up"""
+        # Created here so they belong to this thread's event loop
+        semaphore = asyncio.Semaphore(self.max_workers)
+        queue = asyncio.Queue(maxsize=64)
+        # More consumers than download slots, so URLs waiting to retry don't leave slots idle
+        consumers = self.max_workers * 4
+        self._cancelled = asyncio.Event()
+        with self._loop_lock:
+            self._loop = asyncio.get_running_loop()
+        if self._stop_event.is_set():  # Stopped before the loop existed
+            self._cancelled.set()
+        
+        async def produce():
+            try:
+                with open(self.filepath, 'r', buffering=1 << 16) as file:  # 64 KB reads for long files
+                    for line in file:
+                        if self._stop_event.is_set():
                             break
+                        url = line.strip()  # Strip once per line
+                        if not url or url.startswith('#'):
+                            continue
+                        self._url_count += 1
+                        await queue.put(url)
+            except Exception as e:
+                self.signals.update_signal.emit(f"Error reading file: {str(e)}", "error")
+            finally:
+                for _ in range(consumers):
+                    await queue.put(None)  # Tell each consumer to stop
                     
-                    if attempt < self.max_retries:
-                        time.sleep(self.retry_delay)
-                    else:
-                        self.update_signal.emit(f"  ✗ Failed after {self.max_retries} attempts", "error")
-                        
-                except Exception as e:
-                    self.update_signal.emit(f"  ✗ Exception: {str(e)}", "error")
-                    if attempt == self.max_retries:
-                        break
-                    time.sleep(self.retry_delay)
+        async def consume():
+            while (url := await queue.get()) is not None:
+                if not self._stop_event.is_set():
+                    await self._download_one(url, semaphore, total)
+                
+        try:
+            await asyncio.gather(produce(), *(consume() for _ in range(consumers)))
+        finally:
+            with self._loop_lock:
+                self._loop = None  # Before asyncio.run closes the loop, so request_stop stops using it
         
-        self.finished_signal.emit(success_count, total)
+    async def _download_one(self, url, semaphore, total):
+        """Download one URL and report progress, errors are logged rather than ending the batch"""
+        try:
+            await self._process_one(url, semaphore)
+        except Exception as e:
+            self.signals.update_signal.emit(f"  ✗ {url}: {str(e)}", "error")
+        # Only the event loop thread touches the counters, no lock needed
+        self._completed += 1
+        self.signals.progress_signal.emit(self._completed, total)
+        
+    async def _process_one(self, url, semaphore):
+        """Download a single URL with retries, returns True on success"""
+        # Earlier runs' results for the same URL and settings (tracks only, collections can change)
+        key = ResponseCache.key(url, self.bitrate, self.audio_format, self.output_dir)
+        cached = self._results.lookup(key) if ResponseCache.cacheable(url) else None
+        if cached == 0:
+            self._success_count += 1
+            self.signals.update_signal.emit(f"  ✓ Downloaded in an earlier run, skipped (cached): {url}", "success")
+            return True
+        elif cached in [100, 101]:
+            self.signals.update_signal.emit(f"  ✗ Non-retryable error (cached): {url}", "error")
+            return False
+        elif self._results.mode == "replay":
+            self.signals.update_signal.emit(f"  Not in cache, skipped (replay mode): {url}", "warning")
+            return False
+        
+        # Determine template based on URL type
+        output_template, additional_args = self._templates[url_kind(url)]
+        
+        # Cached metadata is used when there is some, it's only saved before a retry (a save is a Spotify
+        # lookup and spotdl process of its own), so retries don't look the URL up again
+        query = url
+        if self.metadata_cache:
+            query = await asyncio.to_thread(self.metadata_cache.get, url, self._stop_event)
+        
+        # Attempt download with retries
+        attempt = 1
+        rate_limit_waits = 0
+        while attempt <= self.max_retries:
+            if self._stop_event.is_set():
+                return False
+            try:
+                # The slot is only held while downloading, retry waits below don't block other URLs
+                async with semaphore:
+                    if self._stop_event.is_set():  # Stopped while waiting for a slot
+                        return False
+                    if attempt == 1 and not rate_limit_waits:
+                        self.signals.update_signal.emit(f"Processing: {url}", "info")
+                    self.signals.update_signal.emit(f"  Attempt {attempt}/{self.max_retries}: {url}", "info")
+                    # Downloader (and its error handling) stays blocking, so it runs off the loop
+                    if not await asyncio.to_thread(self._bucket.acquire, self._stop_event):
+                        return False
+                    if attempt > 1 and query == url and self.metadata_cache:
+                        query = await asyncio.to_thread(self.metadata_cache.get, url, self._stop_event, True)
+                    result = await asyncio.to_thread(
+                        self.downloader.run_download, query, output_template, additional_args,
+                        on_output=lambda line: self.signals.update_signal.emit(f"    {line}", "info"),
+                        cancel_event=self._stop_event)
+                if self._stop_event.is_set():
+                    return False  # Cancelled mid-download
+                
+                if hasattr(result, 'returncode'):
+                    if result.returncode == 0:
+                        self._success_count += 1
+                        self._results.store(key, url, self.output_dir, 0)
+                        self.signals.update_signal.emit(f"  ✓ Successfully downloaded: {url}", "success")
+                        return True
+                    elif result.returncode in [100, 101]:  # Non-retryable errors
+                        self._results.store(key, url, self.output_dir, result.returncode)
+                        self.signals.update_signal.emit(f"  ✗ Non-retryable error: {url}", "error")
+                        return False
+                
+                # Rate limited, retrying sooner only makes it worse: slow every worker down instead
+                if is_rate_limited(result) and rate_limit_waits < MAX_RATE_LIMIT_WAITS:
+                    rate_limit_waits += 1
+                    self.signals.update_signal.emit(f"  Rate limited, waiting {RATE_LIMIT_WAIT}s: {url}", "warning")
+                    self._bucket.penalize(RATE_LIMIT_WAIT)
+                    continue  # Doesn't count as an attempt
+                
+                if attempt == self.max_retries:
+                    self.signals.update_signal.emit(f"  ✗ Failed after {self.max_retries} attempts: {url}", "error")
+                    
+            except Exception as e:
+                self.signals.update_signal.emit(f"  ✗ Exception: {str(e)}", "error")
+                
+            if attempt < self.max_retries and await self._wait_cancelled(self.backoff_delay(attempt)):
+                return False
+            attempt += 1
+        return False
+    
+    def backoff_delay(self, attempt):
+        """Exponential backoff with jitter, capped at the retry delay setting"""
+        return min(self.retry_delay, BASE_DELAY * 2 ** (attempt - 1)) + random.uniform(0, JITTER)
 
 
 class SpotifyDownloaderGUI(QMainWindow):
+    # Widget styles, applied once to the application and matched by object name
+    _STYLE_SHEET = """
+        QPushButton#downloadButton, QPushButton#batchButton {
+            color: white;
+            font-weight: bold;
+            padding: 10px;
+            border-radius: 5px;
+        }
+        QPushButton#downloadButton { background-color: #4CAF50; }
+        QPushButton#downloadButton:hover { background-color: #45a049; }
+        QPushButton#batchButton { background-color: #2196F3; }
+        QPushButton#batchButton:hover { background-color: #0b7dda; }
+        QPlainTextEdit#consoleOutput {
+            background-color: #f0f0f0;
+            font-family: 'Courier New', monospace;
+        }
+        QPlainTextEdit#logViewer {
+            background-color: #2b2b2b;
+            color: #f0f0f0;
+            font-family: 'Courier New', monospace;
+        }
+    """
+    
+    # Batch console line per message type, filled with the escaped message
+    _BATCH_HTML = {msg_type: f'<font color="{color}">{{}}</font>' for msg_type, color in _COLOR_MAP.items()}
+    
     def __init__(self):
         super().__init__()
         self.downloader = Downloader()
-        self.download_thread = None
-        self.batch_thread = None
+        self.download_worker = None
+        self.batch_worker = None
+        self.user_worker = None
+        # Downloads, user downloads and the spotdl check all run on the global pool,
+        # a long batch keeps one thread busy so make sure there's room for the rest
+        pool = QThreadPool.globalInstance()
+        pool.setMaxThreadCount(max(pool.maxThreadCount(), 4))
+        self._spotdl_ok = None  # Cached spotdl check, None until the first probe finishes
+        self._probe = None
+        self._install_proc = None  # pip install of spotdl while it runs
+        self._install_decoder = None
+        self._suppress_auth_warning = False  # "Don't ask again" for this session only
+        self._last_output_dir = None  # Directory ensure_output_dir created last, forgotten when it may be gone
+        # spotdl is a subprocess so there's no HTTP session to share, sharing resolved track metadata
+        # means repeated URLs and retries skip the Spotify lookups instead (see _metadata_cache)
+        self.metadata_cache = MetadataCache(self.downloader)
+        # Console messages from the download threads, written to the widgets by _flush_log
+        self._log_buf = collections.deque(maxlen=LOG_BUFFER_MAX)
+        self._log_lock = threading.Lock()
+        self._log_dropped = 0  # Messages pushed out of the full buffer since the last flush
+        self._scroll_pending = False  # Batch console needs scrolling to the end on the next tick
         self.init_ui()
         
     def init_ui(self):
         self.setWindowTitle("Spotify Downloader GUI")
         self.setGeometry(100, 100, 900, 700)
+        QApplication.instance().setStyleSheet(self._STYLE_SHEET)
         
         # Central widget
         central_widget = QWidget()
@@ -215,8 +641,14 @@ class SpotifyDownloaderGUI(QMainWindow):
         self.progress_bar.setVisible(False)
         main_layout.addWidget(self.progress_bar)
         
-        # Check spotdl on startup
-        self.check_spotdl_installation()
+        # Write buffered console messages ~10 times a second instead of once per message
+        self._log_timer = QTimer(self)
+        self._log_timer.setInterval(100)
+        self._log_timer.timeout.connect(self._flush_log)
+        self._log_timer.start()
+        
+        # Check spotdl on startup, once the window has painted
+        QTimer.singleShot(0, self._probe_spotdl_async)
         
     def create_single_download_tab(self, tabs):
         """Create the single download tab"""
@@ -266,6 +698,7 @@ class SpotifyDownloaderGUI(QMainWindow):
         output_layout.addWidget(QLabel("Output Directory:"))
         self.output_dir_input = QLineEdit()
         self.output_dir_input.setText("Downloads")
+        self.output_dir_input.textChanged.connect(self.forget_output_dir)
         output_layout.addWidget(self.output_dir_input)
         self.browse_button = QPushButton("Browse...")
         self.browse_button.clicked.connect(self.browse_output_dir)
@@ -280,31 +713,24 @@ class SpotifyDownloaderGUI(QMainWindow):
         # Download button
         self.download_button = QPushButton("Start Download")
         self.download_button.clicked.connect(self.start_single_download)
-        self.download_button.setStyleSheet("""
-            QPushButton {
-                background-color: #4CAF50;
-                color: white;
-                font-weight: bold;
-                padding: 10px;
-                border-radius: 5px;
-            }
-            QPushButton:hover {
-                background-color: #45a049;
-            }
-        """)
+        self.download_button.setObjectName("downloadButton")
         layout.addWidget(self.download_button)
         
+        # Cancel button
+        self.cancel_button = QPushButton("Cancel Download")
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.cancel_single_download)
+        layout.addWidget(self.cancel_button)
+        
         # Console output
         console_group = QGroupBox("Console Output")
         console_layout = QVBoxLayout()
-        self.console_output = QTextEdit()
+        # Plain text appends don't re-layout the whole document, old lines are dropped past the limit
+        self.console_output = QPlainTextEdit()
         self.console_output.setReadOnly(True)
-        self.console_output.setStyleSheet("""
-            QTextEdit {
-                background-color: #f0f0f0;
-                font-family: 'Courier New', monospace;
-            }
-        """)
+        self.console_output.setMaximumBlockCount(5000)
+        self.console_output.setUndoRedoEnabled(False)
+        self.console_output.setObjectName("consoleOutput")
         console_layout.addWidget(self.console_output)
         console_group.setLayout(console_layout)
         layout.addWidget(console_group)
@@ -352,11 +778,17 @@ class SpotifyDownloaderGUI(QMainWindow):
         self.max_retries_spin.setValue(5)
         retry_layout.addWidget(self.max_retries_spin)
         
-        retry_layout.addWidget(QLabel("Retry Delay (seconds):"))
+        retry_layout.addWidget(QLabel("Max Retry Delay (seconds):"))
         self.retry_delay_spin = QSpinBox()
         self.retry_delay_spin.setRange(1, 60)
         self.retry_delay_spin.setValue(20)
         retry_layout.addWidget(self.retry_delay_spin)
+        
+        retry_layout.addWidget(QLabel("Parallel Downloads:"))
+        self.workers_spin = QSpinBox()
+        self.workers_spin.setRange(1, 10)
+        self.workers_spin.setValue(3)  # Higher values risk Spotify rate limiting
+        retry_layout.addWidget(self.workers_spin)
         retry_layout.addStretch()
         
         batch_settings_layout.addLayout(retry_layout)
@@ -372,20 +804,15 @@ class SpotifyDownloaderGUI(QMainWindow):
         # Batch download button
         self.batch_download_button = QPushButton("Start Batch Download")
         self.batch_download_button.clicked.connect(self.start_batch_download)
-        self.batch_download_button.setStyleSheet("""
-            QPushButton {
-                background-color: #2196F3;
-                color: white;
-                font-weight: bold;
-                padding: 10px;
-                border-radius: 5px;
-            }
-            QPushButton:hover {
-                background-color: #0b7dda;
-            }
-        """)
+        self.batch_download_button.setObjectName("batchButton")
         layout.addWidget(self.batch_download_button)
         
+        # Batch cancel button
+        self.batch_cancel_button = QPushButton("Cancel Batch")
+        self.batch_cancel_button.setEnabled(False)
+        self.batch_cancel_button.clicked.connect(self.cancel_batch_download)
+        layout.addWidget(self.batch_cancel_button)
+        
         # Batch progress
         batch_progress_group = QGroupBox("Batch Progress")
         batch_progress_layout = QVBoxLayout()
@@ -396,8 +823,11 @@ class SpotifyDownloaderGUI(QMainWindow):
         self.batch_progress_bar = QProgressBar()
         batch_progress_layout.addWidget(self.batch_progress_bar)
         
+        # Kept as rich text for the colors, but bounded and without an undo stack
         self.batch_console = QTextEdit()
         self.batch_console.setReadOnly(True)
+        self.batch_console.document().setMaximumBlockCount(5000)
+        self.batch_console.setUndoRedoEnabled(False)
         self.batch_console.setMaximumHeight(200)
         batch_progress_layout.addWidget(self.batch_console)
         
@@ -435,8 +865,39 @@ class SpotifyDownloaderGUI(QMainWindow):
         log_browse_button.clicked.connect(lambda: self.browse_directory(self.log_dir_input))
         log_layout.addWidget(log_browse_button)
         
+        # Rate limit
+        rate_layout = QHBoxLayout()
+        rate_layout.addWidget(QLabel("Max Downloads per Minute:"))
+        self.rate_limit_spin = QSpinBox()
+        self.rate_limit_spin.setRange(1, 600)
+        self.rate_limit_spin.setValue(60)
+        rate_layout.addWidget(self.rate_limit_spin)
+        rate_layout.addStretch()
+        
         general_layout.addLayout(temp_layout)
         general_layout.addLayout(log_layout)
+        # Batch result cache
+        cache_layout = QHBoxLayout()
+        cache_layout.addWidget(QLabel("Batch Result Cache:"))
+        self.cache_mode_combo = QComboBox()
+        self.cache_mode_combo.addItems(ResponseCache.MODES)
+        self.cache_mode_combo.setToolTip("disabled: always download\n"
+                                         "enabled: skip tracks finished in earlier runs (playlists and albums always download),\n"
+                                         "Clear Batch Cache to download deleted tracks again\n"
+                                         "replay: only report cached results, download nothing")
+        cache_layout.addWidget(self.cache_mode_combo)
+        clear_cache_button = QPushButton("Clear Batch Cache")
+        clear_cache_button.clicked.connect(self.clear_batch_cache)
+        cache_layout.addWidget(clear_cache_button)
+        cache_layout.addStretch()
+        
+        # Track metadata cache, unchecked resolves every URL with Spotify again
+        self.metadata_cache_check = QCheckBox("Reuse cached track metadata (playlists and albums are always fetched fresh)")
+        self.metadata_cache_check.setChecked(True)
+        
+        general_layout.addLayout(rate_layout)
+        general_layout.addLayout(cache_layout)
+        general_layout.addWidget(self.metadata_cache_check)
         general_group.setLayout(general_layout)
         layout.addWidget(general_group)
         
@@ -445,6 +906,7 @@ class SpotifyDownloaderGUI(QMainWindow):
         spotdl_layout = QVBoxLayout()
         
         self.check_spotdl_button = QPushButton("Check spotdl Installation")
+        self.check_spotdl_button.setToolTip("Shift+click to check again instead of using the last result")
         self.check_spotdl_button.clicked.connect(self.check_spotdl_installation)
         spotdl_layout.addWidget(self.check_spotdl_button)
         
@@ -469,17 +931,21 @@ class SpotifyDownloaderGUI(QMainWindow):
         
         # Add user-specific download buttons
         self.user_playlists_button = QPushButton("Download My Playlists")
-        self.user_playlists_button.clicked.connect(self.download_user_playlists)
+        self.user_playlists_button.clicked.connect(lambda: self.run_user_download("playlists"))
         auth_layout.addWidget(self.user_playlists_button)
         
         self.liked_songs_button = QPushButton("Download Liked Songs")
-        self.liked_songs_button.clicked.connect(self.download_liked_songs)
+        self.liked_songs_button.clicked.connect(lambda: self.run_user_download("liked"))
         auth_layout.addWidget(self.liked_songs_button)
         
         self.saved_albums_button = QPushButton("Download Saved Albums")
-        self.saved_albums_button.clicked.connect(self.download_saved_albums)
+        self.saved_albums_button.clicked.connect(lambda: self.run_user_download("albums"))
         auth_layout.addWidget(self.saved_albums_button)
         
+        self.all_user_button = QPushButton("Download All (Playlists, Liked Songs, Albums)")
+        self.all_user_button.clicked.connect(lambda: self.run_user_download("all"))
+        auth_layout.addWidget(self.all_user_button)
+        
         auth_group.setLayout(auth_layout)
         layout.addWidget(auth_group)
         
@@ -499,7 +965,9 @@ class SpotifyDownloaderGUI(QMainWindow):
         log_select_layout = QHBoxLayout()
         log_select_layout.addWidget(QLabel("Select Log:"))
         self.log_combo = QComboBox()
-        self.log_combo.addItems(["success.log", "failed.log", "error.log"])
+        self.log_combo.addItems(["successes.log", "failure.log", "error.log"])  # As named by the Downloader
+        self._log_paths = {self.log_combo.itemText(i): os.path.join("log", self.log_combo.itemText(i))
+                           for i in range(self.log_combo.count())}
         self.log_combo.currentTextChanged.connect(self.load_log_file)
         log_select_layout.addWidget(self.log_combo)
         
@@ -507,6 +975,10 @@ class SpotifyDownloaderGUI(QMainWindow):
         refresh_button.clicked.connect(self.refresh_logs)
         log_select_layout.addWidget(refresh_button)
         
+        load_full_button = QPushButton("Load Full")
+        load_full_button.clicked.connect(self.load_full_log_file)
+        log_select_layout.addWidget(load_full_button)
+        
         clear_button = QPushButton("Clear Log")
         clear_button.clicked.connect(self.clear_log)
         log_select_layout.addWidget(clear_button)
@@ -514,17 +986,25 @@ class SpotifyDownloaderGUI(QMainWindow):
         logs_layout.addLayout(log_select_layout)
         
         # Log content
-        self.log_viewer = QTextEdit()
+        self.log_viewer = QPlainTextEdit()
         self.log_viewer.setReadOnly(True)
-        self.log_viewer.setStyleSheet("""
-            QTextEdit {
-                background-color: #2b2b2b;
-                color: #f0f0f0;
-                font-family: 'Courier New', monospace;
-            }
-        """)
+        self.log_viewer.setUndoRedoEnabled(False)
+        self.log_viewer.setMaximumBlockCount(LOG_VIEWER_MAX_BLOCKS)
+        self.log_viewer.setObjectName("logViewer")
         logs_layout.addWidget(self.log_viewer)
         
+        # Append new log lines as they're written, only the bytes past the last read are loaded
+        self._log_offsets = {}
+        self._log_shown = None  # Log path the viewer holds, refreshes append to it
+        self._log_decoder = None  # Decodes the appended bytes, keeps characters split across writes
+        self._log_cache = collections.OrderedDict()  # path -> ((path, mtime_ns, size), tail text), last 8 logs loaded
+        # The directory catches logs being created or replaced, only the selected file is watched for writes
+        self._log_watcher = QFileSystemWatcher(["log"], self)
+        self._existing_logs = set()  # Names of the files in log/, rescanned when the directory changes
+        self._scan_logs()
+        self._log_watcher.directoryChanged.connect(self._on_log_dir_changed)
+        self._log_watcher.fileChanged.connect(self._tail_append_log)
+        
         logs_group.setLayout(logs_layout)
         layout.addWidget(logs_group)
         
@@ -558,8 +1038,7 @@ class SpotifyDownloaderGUI(QMainWindow):
         """Preview the contents of the batch file"""
         try:
             with open(file_path, 'r') as file:
-                lines = file.readlines()[:10]  # Show first 10 lines
-                content = ''.join(lines)
+                content = ''.join(itertools.islice(file, 10))  # Only read the first 10 lines
                 if len(content) > 500:  # Limit preview
                     content = content[:500] + "\n... (truncated)"
                 self.file_preview.setText(content)
@@ -580,7 +1059,7 @@ class SpotifyDownloaderGUI(QMainWindow):
             QMessageBox.warning(self, "Warning", "Please enter a valid Spotify URL or enable search mode.")
             return
         else:
-            if "playlist" in url.lower():
+            if url_kind(url) == 'playlist':
                 download_type = "playlist"
             else:
                 download_type = "track_album"
@@ -590,12 +1069,12 @@ class SpotifyDownloaderGUI(QMainWindow):
         bitrate = self.bitrate_combo.currentText()
         audio_format = self.format_combo.currentText()
         
-        # Create output directory if it doesn't exist
-        os.makedirs(output_dir, exist_ok=True)
+        # The output directory is created by the download worker
         
         # Disable download button
         self.download_button.setEnabled(False)
         self.download_button.setText("Downloading...")
+        self.cancel_button.setEnabled(True)
         
         # Show progress bar
         self.progress_bar.setVisible(True)
@@ -604,29 +1083,33 @@ class SpotifyDownloaderGUI(QMainWindow):
         # Clear console
         self.console_output.clear()
         
-        # Start download thread
-        self.download_thread = DownloadThread(
+        # Create the download worker
+        self.download_worker = DownloadWorker(
             self.downloader,
             url,
             download_type,
             output_dir,
             bitrate,
-            audio_format
+            audio_format,
+            self._metadata_cache(),
+            self.ensure_output_dir
         )
         
         # Connect signals
-        self.download_thread.update_signal.connect(self.update_console)
-        self.download_thread.finished_signal.connect(self.download_finished)
+        # update_console only buffers, so it's called straight from the thread
+        self.download_worker.signals.update_signal.connect(self.update_console, Qt.DirectConnection)
+        self.download_worker.signals.finished_signal.connect(self.download_finished)
         
-        # Start thread
-        self.download_thread.start()
+        # Run it on the pool
+        QThreadPool.globalInstance().start(self.download_worker)
         
     def start_batch_download(self):
         """Start batch download from file"""
         file_path = self.batch_file_input.text()
-        if not file_path or not os.path.exists(file_path):
+        if not file_path:
             QMessageBox.warning(self, "Warning", "Please select a valid text file.")
             return
+        # The batch worker checks the file, counts it and creates the output directory
             
         # Get settings
         if self.use_same_settings_check.isChecked():
@@ -639,124 +1122,278 @@ class SpotifyDownloaderGUI(QMainWindow):
             bitrate = "320k"
             audio_format = "mp3"
             
-        # Create output directory
-        os.makedirs(output_dir, exist_ok=True)
-        
         # Disable button
         self.batch_download_button.setEnabled(False)
         self.batch_download_button.setText("Downloading...")
+        self.batch_cancel_button.setEnabled(True)
         
         # Clear console
         self.batch_console.clear()
+        self.batch_progress_bar.setValue(0)
         
-        # Start batch download thread
-        self.batch_thread = BatchDownloadThread(
+        # Create the batch worker
+        self.batch_worker = BatchDownloadWorker(
             self.downloader,
             file_path,
             output_dir,
             bitrate,
             audio_format,
             self.max_retries_spin.value(),
-            self.retry_delay_spin.value()
+            self.retry_delay_spin.value(),
+            self.workers_spin.value(),
+            self.rate_limit_spin.value(),
+            self._metadata_cache(),
+            os.path.join(self.log_dir_input.text(), "batch_results.sqlite"),
+            self.cache_mode_combo.currentText(),
+            self.ensure_output_dir
         )
         
         # Connect signals
-        self.batch_thread.update_signal.connect(self.update_batch_console)
-        self.batch_thread.progress_signal.connect(self.update_batch_progress)
-        self.batch_thread.finished_signal.connect(self.batch_download_finished)
+        self.batch_worker.signals.update_signal.connect(self.update_batch_console, Qt.DirectConnection)
+        self.batch_worker.signals.progress_signal.connect(self.update_batch_progress)
+        self.batch_worker.signals.finished_signal.connect(self.batch_download_finished)
+        self.batch_worker.signals.error_signal.connect(self.batch_download_error)
+        
+        # Run it on the pool
+        QThreadPool.globalInstance().start(self.batch_worker)
+        
+    def ensure_output_dir(self, path):
+        """os.makedirs(path, exist_ok=True), skipped while path is the directory created last
+        Called from the workers, at worst two of them both create the same directory"""
+        if path != self._last_output_dir:
+            os.makedirs(path, exist_ok=True)
+            self._last_output_dir = path
+            
+    def forget_output_dir(self):
+        """Have the next download create its directory again (the setting changed or a download failed)"""
+        self._last_output_dir = None
         
-        # Start thread
-        self.batch_thread.start()
+    def _metadata_cache(self):
+        """The shared metadata cache, or None when the user turned it off in Settings"""
+        return self.metadata_cache if self.metadata_cache_check.isChecked() else None
         
+    def clear_batch_cache(self):
+        """Forget every batch result, the next batch downloads everything again"""
+        try:
+            cache = ResponseCache(os.path.join(self.log_dir_input.text(), "batch_results.sqlite"), "enabled")
+            try:
+                cache.clear()
+            finally:
+                cache.close()
+            self.status_bar.showMessage("Batch result cache cleared")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Error clearing the batch cache: {str(e)}")
+            
+    def cancel_single_download(self):
+        """Stop the running single download"""
+        if self.download_worker is not None:
+            self.cancel_button.setEnabled(False)
+            self.status_bar.showMessage("Cancelling download...")
+            self.download_worker.request_stop()
+            
+    def cancel_batch_download(self):
+        """Stop the running batch, URLs already finished are kept"""
+        if self.batch_worker is not None:
+            self.batch_cancel_button.setEnabled(False)
+            self.status_bar.showMessage("Cancelling batch...")
+            self.batch_worker.request_stop()
+            
     def update_console(self, message):
-        """Update console with download messages"""
-        self.console_output.append(message)
+        """Queue a download message for the console (safe to call from any thread)"""
+        self._buffer_log((None, message))
         
+    _log = update_console  # Console lines written from the GUI thread go through the same buffer
+    
     def update_batch_console(self, message, msg_type):
-        """Update batch console with colored messages"""
-        color_map = {
-            "info": "black",
-            "success": "green",
-            "error": "red",
-            "warning": "orange"
-        }
-        
-        color = color_map.get(msg_type, "black")
-        self.batch_console.append(f'<font color="{color}">{message}</font>')
-        # Auto-scroll to bottom
-        self.batch_console.verticalScrollBar().setValue(
-            self.batch_console.verticalScrollBar().maximum()
-        )
+        """Queue a colored message for the batch console (safe to call from any thread)"""
+        # Escaped so URLs or spotdl output containing < or & can't corrupt the console
+        line = self._BATCH_HTML.get(msg_type, self._BATCH_HTML["info"]).format(_escape(message))
+        self._buffer_log(("batch", line))
+        
+    def _buffer_log(self, entry):
+        """Add a (target, line) to the buffer, counting the oldest one if it's pushed out"""
+        with self._log_lock:
+            if len(self._log_buf) == LOG_BUFFER_MAX:
+                self._log_dropped += 1
+            self._log_buf.append(entry)
+            
+    def _flush_log(self):
+        """Write everything buffered since the last tick, one insert per console"""
+        with self._log_lock:
+            entries, self._log_buf = self._log_buf, collections.deque(maxlen=LOG_BUFFER_MAX)
+            dropped, self._log_dropped = self._log_dropped, 0
+            
+        console_lines = [f"… {dropped} earlier messages dropped"] if dropped else []
+        batch_lines = []
+        for target, line in entries:
+            (batch_lines if target == "batch" else console_lines).append(line)
+                
+        if console_lines:
+            self.console_output.appendPlainText("\n".join(console_lines))
+            
+        if batch_lines:
+            # One block per message so the console's maximum block count can trim old lines,
+            # grouped into one edit so the document is laid out once
+            cursor = QTextCursor(self.batch_console.document())
+            cursor.movePosition(QTextCursor.End)
+            cursor.beginEditBlock()
+            for line in batch_lines:
+                if not self.batch_console.document().isEmpty():
+                    cursor.insertBlock()
+                cursor.insertHtml(line)
+            cursor.endEditBlock()
+            self._scroll_pending = True
+            
+        # Auto-scroll to bottom, maximum() lays the document out so it's done at most once a tick
+        if self._scroll_pending:
+            self._scroll_pending = False
+            scrollbar = self.batch_console.verticalScrollBar()
+            scrollbar.setValue(scrollbar.maximum())
         
     def update_batch_progress(self, current, total):
         """Update batch progress bar"""
         self.batch_progress_bar.setMaximum(total)
         self.batch_progress_bar.setValue(current)
-        self.batch_progress_label.setText(f"Processing {current} of {total}")
+        self.batch_progress_label.setText(f"Completed {current} of {total}")
         
     def download_finished(self, success, message):
         """Handle completion of single download"""
+        self.download_worker = None
+        self._flush_log()  # Show the thread's last messages before the result
         self.download_button.setEnabled(True)
         self.download_button.setText("Start Download")
+        self.cancel_button.setEnabled(False)
         self.progress_bar.setVisible(False)
         
         if success:
             self.status_bar.showMessage("Download completed successfully!")
-            self.console_output.append("\n✓ Download completed!")
+            self.console_output.appendPlainText("\n✓ Download completed!")
         else:
+            self.forget_output_dir()  # In case the directory went missing
             self.status_bar.showMessage(f"Download failed: {message}")
-            self.console_output.append(f"\n✗ Download failed: {message}")
+            self.console_output.appendPlainText(f"\n✗ Download failed: {message}")
             
     def batch_download_finished(self, success_count, total_count):
         """Handle completion of batch download"""
+        self.batch_worker = None
+        self._flush_log()  # Show the thread's last messages before the summary
         self.batch_download_button.setEnabled(True)
         self.batch_download_button.setText("Start Batch Download")
+        self.batch_cancel_button.setEnabled(False)
         
         # Show completion message
         if total_count > 0:
             self.batch_console.append(f"\n{'='*50}")
             self.batch_console.append(f"<b>Batch Download Complete!</b>")
             self.batch_console.append(f"Successfully downloaded: {success_count}/{total_count}")
+            self._scroll_pending = True
             
             if success_count == total_count:
                 self.status_bar.showMessage(f"All downloads completed successfully!")
             else:
+                self.forget_output_dir()  # In case the directory went missing
                 self.status_bar.showMessage(f"Completed with {total_count - success_count} failures")
         else:
             self.status_bar.showMessage("Batch download completed (no URLs found)")
             
+    def batch_download_error(self, message):
+        """The batch worker couldn't start, e.g. the batch file doesn't exist"""
+        self.batch_download_finished(0, 0)
+        self.status_bar.showMessage("Batch download not started")
+        QMessageBox.warning(self, "Warning", message)
+        
     def check_spotdl_installation(self):
-        """Check if spotdl is installed"""
-        try:
-            if self.downloader.check_spotdl():
+        """Check if spotdl is installed, reuses the last result unless Shift is held"""
+        force = bool(QApplication.keyboardModifiers() & Qt.ShiftModifier)
+        if self._spotdl_ok is None or force:
+            self._probe_spotdl_async(notify=True)
+        else:
+            self._on_spotdl_probed(self._spotdl_ok, notify=True)
+            
+    def _probe_spotdl_async(self, notify=False):
+        """Run the spotdl check on the global thread pool, the result arrives in _on_spotdl_probed"""
+        if self._probe is not None:
+            return  # Already checking
+        self.check_spotdl_button.setEnabled(False)
+        self.status_bar.showMessage("Checking spotdl installation...")
+        self._probe = SpotdlProbe(self.downloader)
+        self._probe.signals.result.connect(lambda ok: self._on_spotdl_probed(ok, notify))
+        QThreadPool.globalInstance().start(self._probe)
+        
+    def _on_spotdl_probed(self, ok, notify=False):
+        """Cache and report the spotdl check"""
+        self._probe = None
+        self._spotdl_ok = ok
+        self.check_spotdl_button.setEnabled(True)
+        if ok:
+            self.status_bar.showMessage("spotdl is installed and ready")
+            if notify:
                 QMessageBox.information(self, "spotdl Check", "spotdl is installed and ready!")
-            else:
-                reply = QMessageBox.question(
-                    self,
-                    "spotdl Not Found",
-                    "spotdl is not installed. Would you like to install it now?",
-                    QMessageBox.Yes | QMessageBox.No
-                )
-                if reply == QMessageBox.Yes:
-                    self.install_spotdl()
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Error checking spotdl: {str(e)}")
+        else:
+            self.status_bar.showMessage("spotdl not found")
+            reply = QMessageBox.question(
+                self,
+                "spotdl Not Found",
+                "spotdl is not installed. Would you like to install it now?",
+                QMessageBox.Yes | QMessageBox.No
+            )
+            if reply == QMessageBox.Yes:
+                self.install_spotdl()
             
     def install_spotdl(self):
-        """Install spotdl"""
-        import subprocess
-        import sys
-        
-        self.console_output.append("Installing spotdl...")
-        
-        try:
-            subprocess.check_call([sys.executable, "-m", "pip", "install", "spotdl"])
+        """Install spotdl, pip's output streams into the console and the result arrives in _install_done"""
+        if self._install_proc is not None:
+            return  # Already installing
+        self._log("Installing spotdl...")
+        self.status_bar.showMessage("Installing spotdl...")
+        
+        # QProcess reports output and exit through the event loop, no reader thread needed
+        proc = QProcess(self)
+        proc.setProgram(sys.executable)
+        proc.setArguments(["-m", "pip", "install", "spotdl"])
+        proc.setProcessChannelMode(QProcess.MergedChannels)
+        proc.readyReadStandardOutput.connect(self._drain_install)
+        proc.errorOccurred.connect(self._on_spotdl_install_error)
+        proc.finished.connect(self._install_done)
+        self._install_proc = proc
+        self._install_decoder = codecs.getincrementaldecoder('utf-8')('replace')  # Reads can split a character
+        proc.start()
+        
+    def _drain_install(self):
+        """Move what pip has printed so far into the console"""
+        data = bytes(self._install_proc.readAllStandardOutput())
+        if data:
+            self._log(self._install_decoder.decode(data).rstrip("\n"))
+            
+    def _install_done(self, exit_code, exit_status):
+        """Report the pip install once it exits"""
+        self._drain_install()
+        self._install_proc.deleteLater()
+        self._install_proc = None
+        self._flush_log()  # pip's last lines before the result
+        if exit_status == QProcess.NormalExit and exit_code == 0:
+            self._spotdl_ok = True
+            self.status_bar.showMessage("spotdl is installed and ready")
+            self.console_output.appendPlainText("✓ spotdl installed successfully!")
             QMessageBox.information(self, "Success", "spotdl installed successfully!")
-            self.console_output.append("✓ spotdl installed successfully!")
-        except subprocess.CalledProcessError as e:
-            QMessageBox.critical(self, "Error", f"Failed to install spotdl: {str(e)}")
-            self.console_output.append(f"✗ Failed to install spotdl: {str(e)}")
+        else:
+            self.status_bar.showMessage("spotdl install failed")
+            self.console_output.appendPlainText(f"✗ Failed to install spotdl: pip exited with code {exit_code}")
+            QMessageBox.critical(self, "Error", f"Failed to install spotdl: pip exited with code {exit_code}")
+            
+    def _on_spotdl_install_error(self, error):
+        """pip couldn't be started, finished isn't emitted in that case"""
+        if error != QProcess.FailedToStart:
+            return  # Crashes are reported by _install_done
+        message = self._install_proc.errorString()
+        self._install_proc.deleteLater()
+        self._install_proc = None
+        self._flush_log()
+        self.status_bar.showMessage("spotdl install failed")
+        self.console_output.appendPlainText(f"✗ Failed to install spotdl: {message}")
+        QMessageBox.critical(self, "Error", f"Failed to install spotdl: {message}")
             
+
     def show_spotdl_help(self):
         """Show spotdl help"""
         try:
@@ -771,94 +1408,190 @@ class SpotifyDownloaderGUI(QMainWindow):
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error showing info: {str(e)}")
             
-    def download_user_playlists(self):
-        """Download user playlists (requires authentication)"""
-        self.run_user_download("playlists")
-        
-    def download_liked_songs(self):
-        """Download liked songs (requires authentication)"""
-        self.run_user_download("liked")
-        
-    def download_saved_albums(self):
-        """Download saved albums (requires authentication)"""
-        self.run_user_download("albums")
-        
     def run_user_download(self, download_type):
-        """Run user-specific download with authentication"""
+        """Run user-specific download with authentication
+        download_type is a _DL_DISPATCH kind, or "all" for every kind"""
         # Get current settings
         output_dir = self.output_dir_input.text()
         bitrate = self.bitrate_combo.currentText()
         audio_format = self.format_combo.currentText()
         
-        # Create output directory
-        os.makedirs(output_dir, exist_ok=True)
-        
-        # Show warning about authentication
-        reply = QMessageBox.warning(
-            self,
-            "Spotify Authentication Required",
-            f"This will open a browser window for Spotify authentication.\n"
-            f"You need to be logged into your Spotify account.\n"
-            f"Do you want to continue?",
-            QMessageBox.Yes | QMessageBox.No
-        )
-        
-        if reply != QMessageBox.Yes:
+        if self.user_worker is not None:
+            QMessageBox.warning(self, "Warning", "A user download is already running.")
             return
+        
+        # Show warning about authentication, unless the user asked not to see it again this session
+        if not self._suppress_auth_warning:
+            box = QMessageBox(
+                QMessageBox.Warning,
+                "Spotify Authentication Required",
+                f"This will open a browser window for Spotify authentication.\n"
+                f"You need to be logged into your Spotify account.\n"
+                f"Do you want to continue?",
+                QMessageBox.Yes | QMessageBox.No,
+                self
+            )
+            dont_ask = QCheckBox("Don't ask again this session")
+            box.setCheckBox(dont_ask)
+            if box.exec_() != QMessageBox.Yes:
+                return
+            if dont_ask.isChecked():
+                self._suppress_auth_warning = True
             
-        # Run the appropriate download method
-        try:
-            self.console_output.append(f"Starting {download_type} download...")
-            
-            # Configure downloader
-            self.downloader._Downloader__bitrate = bitrate
-            self.downloader._Downloader__audio_format = audio_format
-            self.downloader._Downloader__output_dir = Path(output_dir)
-            
-            # Call the appropriate method
-            if download_type == "playlists":
-                success = self.downloader.download_user_playlist()
-            elif download_type == "liked":
-                success = self.downloader.download_user_liked_songs()
-            elif download_type == "albums":
-                success = self.downloader.download_user_saved_albums()
-                
-            if success:
-                self.console_output.append(f"✓ {download_type.capitalize()} downloaded successfully!")
-                QMessageBox.information(self, "Success", f"{download_type.capitalize()} downloaded successfully!")
-            else:
-                self.console_output.append(f"✗ Failed to download {download_type}")
-                QMessageBox.warning(self, "Warning", f"Failed to download {download_type}")
-                
-        except Exception as e:
-            self.console_output.append(f"✗ Error: {str(e)}")
-            QMessageBox.critical(self, "Error", f"Error downloading {download_type}: {str(e)}")
+        # Configure downloader, the download itself runs on the thread pool
+        self.downloader.configure(bitrate=bitrate, audio_format=audio_format, output_dir=output_dir)
+        
+        self.user_worker = UserDownloadWorker(self.downloader, download_type, output_dir, self.ensure_output_dir)
+        self.user_worker.signals.update_signal.connect(self.update_console, Qt.DirectConnection)
+        self.user_worker.signals.finished_signal.connect(
+            lambda success, error: self.user_download_finished(download_type, success, error))
+        QThreadPool.globalInstance().start(self.user_worker)
+        label = _DL_DISPATCH[download_type][1] if download_type in _DL_DISPATCH else _ALL_USER_LABEL
+        self.status_bar.showMessage(f"Downloading {label}...")
+        
+    def user_download_finished(self, download_type, success, error):
+        """Handle completion of a user download"""
+        self.user_worker = None
+        self._flush_log()  # Show the worker's messages before the result
+        label = _DL_DISPATCH[download_type][1] if download_type in _DL_DISPATCH else _ALL_USER_LABEL
+        if error or not success:
+            self.forget_output_dir()  # In case the directory went missing
+        if error:
+            self.status_bar.showMessage(f"Error downloading {label}")
+            self.console_output.appendPlainText(f"✗ Error: {error}")
+            QMessageBox.critical(self, "Error", f"Error downloading {label}: {error}")
+        elif success:
+            self.status_bar.showMessage(f"{label} downloaded successfully!")
+            self.console_output.appendPlainText(f"✓ {label} downloaded successfully!")
+            QMessageBox.information(self, "Success", f"{label} downloaded successfully!")
+        else:
+            self.status_bar.showMessage(f"Failed to download {label}")
+            self.console_output.appendPlainText(f"✗ Failed to download {label}")
+            QMessageBox.warning(self, "Warning", f"Failed to download {label}")
             
+
     def load_log_file(self):
-        """Load the selected log file"""
+        """Load the end of the selected log file"""
+        self._show_log(full=False)
+        
+    def load_full_log_file(self):
+        """Load all of the selected log file"""
+        self._show_log(full=True)
+        
+    def _show_log(self, full):
+        """Show the selected log, only its last LOG_TAIL_BYTES unless full"""
         log_file = self.log_combo.currentText()
-        log_path = os.path.join("log", log_file)
+        log_path = self._log_paths[log_file]
         
-        if os.path.exists(log_path):
+        if log_file in self._existing_logs:
             try:
-                with open(log_path, 'r', encoding='utf-8') as file:
-                    content = file.read()
-                self.log_viewer.setText(content)
+                # Unchanged since it was last read, reuse the decoded text
+                st = os.stat(log_path)
+                key = (log_path, st.st_mtime_ns, st.st_size)
+                cached = self._log_cache.get(log_path)
+                if not full and cached and cached[0] == key:
+                    self._log_cache.move_to_end(log_path)
+                    text = cached[1]
+                    self._log_offsets[log_path] = st.st_size
+                else:
+                    with open(log_path, 'rb') as file:
+                        truncated = not full and st.st_size > LOG_TAIL_BYTES
+                        if truncated:
+                            file.seek(st.st_size - LOG_TAIL_BYTES)
+                            file.readline()  # Drop the partial first line
+                        text = file.read().decode('utf-8', 'replace')
+                        self._log_offsets[log_path] = file.tell()
+                    if truncated:
+                        text = f"…[truncated, showing last {LOG_TAIL_BYTES // 1024}KB]\n" + text
+                    if not full:
+                        self._log_cache[log_path] = (key, text)
+                        self._log_cache.move_to_end(log_path)
+                        if len(self._log_cache) > 8:
+                            self._log_cache.popitem(last=False)
+                self.log_viewer.setMaximumBlockCount(0 if full else LOG_VIEWER_MAX_BLOCKS)
+                self.log_viewer.setPlainText(text)
+                self._log_shown = log_path
+                self._log_decoder = codecs.getincrementaldecoder('utf-8')('replace')
+                self._watch_log(log_path)
+                return
+            except FileNotFoundError:
+                self._existing_logs.discard(log_file)  # Deleted before the watcher said so
             except Exception as e:
-                self.log_viewer.setText(f"Error reading log file: {str(e)}")
-        else:
-            self.log_viewer.setText("Log file does not exist yet.")
+                self._log_shown = None
+                self.log_viewer.setPlainText(f"Error reading log file: {str(e)}")
+                return
+        self._log_shown = None
+        self._watch_log(None)
+        self.log_viewer.setPlainText("Log file does not exist yet.")
+            
+    def _watch_log(self, log_path):
+        """Watch log_path for writes instead of the previously selected log"""
+        stale = [path for path in self._log_watcher.files() if path != log_path]
+        if stale:
+            self._log_watcher.removePaths(stale)
+        if log_path and log_path not in self._log_watcher.files():
+            self._log_watcher.addPath(log_path)
+            
+    def _on_log_dir_changed(self, path):
+        """A log was created, deleted or replaced, pick up the selected one"""
+        self._scan_logs()
+        self._tail_append_log(self._log_paths[self.log_combo.currentText()])
+        
+    def _scan_logs(self):
+        """Snapshot which files exist in log/"""
+        try:
+            with os.scandir("log") as entries:
+                self._existing_logs = {entry.name for entry in entries if entry.is_file()}
+        except OSError:
+            self._existing_logs = set()
+            
+    def _tail_append_log(self, log_path):
+        """Append what was written to a watched log since it was last read"""
+        log_file = self.log_combo.currentText()
+        if log_path != self._log_paths[log_file]:
+            return  # Read in full when it's selected
+        if log_file in self._existing_logs and log_path not in self._log_watcher.files():
+            self._log_watcher.addPath(log_path)  # Files replaced on disk drop out of the watcher
+        if self._log_shown != log_path:
+            self.load_log_file()  # Created since it was selected
+            return
+            
+        offset = self._log_offsets.get(log_path, 0)
+        try:
+            size = os.path.getsize(log_path)
+        except OSError:
+            size = -1  # Deleted
+        if size < offset:  # Cleared, rotated or deleted, start over
+            self.load_log_file()
+            return
+            
+        try:
+            with open(log_path, 'rb') as file:
+                file.seek(offset)
+                chunk = file.read()
+                self._log_offsets[log_path] = file.tell()
+        except OSError:  # Deleted or rotated since the size check
+            self.load_log_file()
+            return
+        if chunk:
+            self.log_viewer.moveCursor(QTextCursor.End)
+            self.log_viewer.insertPlainText(self._log_decoder.decode(chunk))
             
     def refresh_logs(self):
-        """Refresh log files"""
-        self.load_log_file()
+        """Refresh log files, only what was written since the last read is loaded"""
+        self._scan_logs()  # Don't rely on the watcher when asked explicitly
+        log_path = self._log_paths[self.log_combo.currentText()]
+        if self._log_shown == log_path and log_path in self._log_offsets:
+            self._tail_append_log(log_path)
+        else:
+            self.load_log_file()
         
     def clear_log(self):
         """Clear the current log file"""
         log_file = self.log_combo.currentText()
-        log_path = os.path.join("log", log_file)
+        log_path = self._log_paths[log_file]
         
-        if os.path.exists(log_path):
+        if log_file in self._existing_logs:
             reply = QMessageBox.question(
                 self,
                 "Clear Log",
@@ -868,24 +1601,35 @@ class SpotifyDownloaderGUI(QMainWindow):
             
             if reply == QMessageBox.Yes:
                 try:
-                    with open(log_path, 'w', encoding='utf-8') as file:
-                        file.write("")
+                    os.truncate(log_path, 0)
                     self.load_log_file()
                     QMessageBox.information(self, "Success", "Log cleared successfully!")
+                except FileNotFoundError:
+                    self.load_log_file()  # Removed since it was checked, shows it doesn't exist
                 except Exception as e:
                     QMessageBox.critical(self, "Error", f"Error clearing log: {str(e)}")
                     
     def closeEvent(self, event):
         """Handle window close event"""
-        # Stop any running threads
-        if self.download_thread and self.download_thread.isRunning():
-            self.download_thread.terminate()
-            self.download_thread.wait()
+        # Stop the running downloads, queued work is dropped and the pool gets one 2 second wait to finish
+        # (request_stop has the workers ask their spotdl processes to exit)
+        for worker in (self.download_worker, self.batch_worker, self.user_worker):
+            if worker is not None:
+                worker.request_stop()
+        pool = QThreadPool.globalInstance()
+        pool.clear()
+        if not pool.waitForDone(2000):
+            # Still going, they've had their chance to exit: kill every spotdl process at once
+            # so the workers return straight away
+            self.downloader.close(timeout=0)
+            pool.waitForDone(500)
             
-        if self.batch_thread and self.batch_thread.isRunning():
-            self.batch_thread.terminate()
-            self.batch_thread.wait()
+        if self._install_proc is not None:
+            self._install_proc.finished.disconnect()  # No result dialog while closing
+            self._install_proc.kill()
+            self._install_proc.waitForFinished(2000)
             
+        self.metadata_cache.close()
         event.accept()
 
 
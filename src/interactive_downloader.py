@@ -20,8 +20,16 @@ Its features a:
 import sys
 import os # For directory creation
 import subprocess # To run the spotdl in the background
+import signal
 import shutil
 import time # Time 
+import re
+import shelve # Metadata cache index
+import dbm
+import sqlite3 # Batch result cache
+import hashlib
+import threading
+import functools
 from pathlib import Path
 from datetime import datetime
 import logging # Logging
@@ -34,6 +42,10 @@ This part of the pre-configuration of the downloader, it can be change. Each par
 * ERROR_LOG - Logs error in the download process (subject to change)
 * MAX_RETRIES - No of times the downloader can retry on a link (subject to change)
 * RETRY_DELAY - The delay between each retry (subject to change)
+* METADATA_CACHE_DIR - Where resolved Spotify metadata is kept between downloads (subject to change)
+* METADATA_CACHE_TTL - How long (seconds) cached track metadata is trusted before asking Spotify again (subject to change)
+* RESULT_CACHE_TTL - How long (seconds) a cached batch result is trusted before the url is downloaded again (subject to change)
+* DOWNLOAD_IDLE_TIMEOUT - Seconds spotdl can go without printing anything before it's treated as stuck (subject to change)
 ======================================================================================================= """
 USER_CONSOLE = r"log.console.log"
 SUCCESS_LOG = r"log\successes.log" 
@@ -41,6 +53,10 @@ FAILED_LOG = r"log\failure.log"
 ERROR_LOG = r"log\error.log"
 MAX_RETRIES = 5
 RETRY_DELAY = 20
+METADATA_CACHE_DIR = Path.home() / ".cache" / "spdl"
+METADATA_CACHE_TTL = 7 * 24 * 60 * 60 # 7 days
+RESULT_CACHE_TTL = 24 * 60 * 60 # 1 day
+DOWNLOAD_IDLE_TIMEOUT = 5 * 60
 
 os.makedirs("log", exist_ok=True)
 """=========================================== Logger ===========================================
@@ -56,7 +72,7 @@ console_logger = logging.getLogger("console")
 successful_downloads.setLevel(logging.INFO)
 failed_downloads.setLevel(logging.INFO)
 error_downloads.setLevel(logging.ERROR)
-console_logger.setLevel(logging.INFO, logging.ERROR)
+console_logger.setLevel(logging.INFO)
 
 # Disable propagation to avoid duplicate logging
 successful_downloads.propagate = False
@@ -100,6 +116,16 @@ console_stream_handler.setFormatter(log_format)
 console_logger.addHandler(console_stream_handler)
 
 """ =========================================== The Downloader Class =========================================== """
+@functools.cache
+def _spotdl_executable():
+    """ Resolve the spotdl executable once instead of searching PATH for every download"""
+    return shutil.which("spotdl") or "spotdl"
+
+@functools.lru_cache(maxsize=1024)
+def _download_argv(client, url, output, base_argv, extra):
+    """ The spotdl download command for a url and settings, built once and reused by every retry"""
+    return (client, "download", url, "--output", output) + base_argv + extra
+
 class Downloader:
     def __init__(self):
         """
@@ -117,6 +143,9 @@ class Downloader:
         self.__audio_format = "mp3"
         self.__filepath = r"links/spotify_links.txt"
         self.__lyrics_provider = None
+        self.__procs = set() # spotdl processes currently running
+        self.__procs_lock = threading.Lock()
+        self.__rebuild_base_argv()
    
     """ Logger functions"""
     def log_success(self, message: str):
@@ -135,34 +164,184 @@ class Downloader:
         console_logger.error(f"{message}")
     
     """ Required"""
-    def run_download(self, url: str, output_dir: Path, additional_args=None):
+    def configure(self, bitrate: str = None, audio_format: str = None, output_dir=None):
         """
-        Method to run Spotdl's download command
+        Apply download settings chosen outside the interactive prompts (e.g. the GUI)
+        bitrate, audio_format and output_dir are left as they are when not given
+        Calling it again with the same settings is a no-op
         """
-        command = [
-            "spotdl",
-            "download",
-            url,
-            "--output", output_dir,
+        cfg = (bitrate, audio_format, output_dir)
+        if cfg == self.__last_cfg:
+            return
+        if bitrate is not None:
+            self.__bitrate = bitrate
+        if audio_format is not None:
+            self.__audio_format = audio_format
+        if output_dir is not None:
+            self.__output_dir = Path(output_dir)
+        self.__rebuild_base_argv()
+        self.__last_cfg = cfg
+        
+    def __rebuild_base_argv(self):
+        """ The spotdl options every download shares, rebuilt whenever the settings change"""
+        self.__last_cfg = None # Settings changed, configure() has to apply its arguments again
+        base_argv = [
             "--overwrite", "skip",
             "--bitrate", self.__bitrate,
             "--format", self.__audio_format,
         ]
         if self.__lyrics_provider:
-            command.extend(["--lyrics", self.__lyrics_provider])
+            base_argv.extend(["--lyrics", self.__lyrics_provider])
+        self._base_argv = tuple(base_argv)
+        
+    def get_client(self):
+        """
+        The spotdl executable downloads run with (resolved once and shared by every download)
+        """
+        return _spotdl_executable()
+    
+    def build_argv(self, url: str, output_template, extra=()):
+        """
+        The full spotdl download command for a url with the current settings
+        Cached, so build it once before retrying and pass it to run_download(argv=...)
+        """
+        return _download_argv(self.get_client(), url, str(output_template), self._base_argv, tuple(extra or ()))
+    
+    def close(self, timeout=5):
+        """
+        Release what the downloader holds on to, call when finished with it
+        Stops any spotdl process still running, they share one timeout before being killed
+        """
+        with self.__procs_lock:
+            procs = list(self.__procs)
+        self.__stop_processes(procs, timeout)
+        _spotdl_executable.cache_clear()
+        _download_argv.cache_clear()
+        
+    def __signal_group(self, proc, sig):
+        """ Send sig to spotdl's whole process group (ffmpeg included), or just spotdl where there are no groups"""
+        try:
+            if hasattr(os, "killpg"):
+                os.killpg(proc.pid, sig)
+            elif sig == signal.SIGTERM:
+                proc.terminate()
+            else:
+                proc.kill()
+        except (ProcessLookupError, PermissionError):
+            pass # Already gone
+            
+    def __stop_process(self, proc):
+        """ Ask spotdl and its children to exit, kill them if they haven't within 5 seconds"""
+        self.__stop_processes([proc], 5)
         
-        if additional_args:
-            command.extend(additional_args)
+    def __stop_processes(self, procs, timeout):
+        """ Ask every process (and its children) to exit, then kill whatever is left once timeout seconds have passed"""
+        for proc in procs:
+            self.__signal_group(proc, signal.SIGTERM)
+        deadline = time.monotonic() + timeout
+        for proc in procs:
+            try:
+                proc.wait(timeout=max(0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                pass
+        # Also reaps any child that outlived spotdl and would keep the output pipe open
+        for proc in procs:
+            self.__signal_group(proc, getattr(signal, "SIGKILL", signal.SIGTERM))
+        for proc in procs:
+            proc.wait()
             
+    def __run_user_download(self, target: str, on_output=None, cancel_event=None):
+        """
+        Run a --user-auth spotdl download with the current settings
+        Output is streamed rather than captured, so the result's stdout is None and stderr holds
+        spotdl's output only when it failed (like the other user download checks expect)
+        """
+        command = [self.get_client(), "download", target, "--user-auth",
+                   "--output", str(self.__output_dir), *self._base_argv]
         try:
-            result = subprocess.run(
-                command,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                check=True
-            )
-            return result
+            # No idle timeout, spotdl is quiet while the user authorizes in the browser
+            self.__run_streamed(command, on_output or print, cancel_event)
+            return subprocess.CompletedProcess(command, 0, None, "")
+        except subprocess.CalledProcessError as e:
+            return subprocess.CompletedProcess(command, e.returncode, None, e.stderr)
+            
+    def __run_streamed(self, command, on_output=None, cancel_event=None, idle_timeout=None):
+        """
+        Run a spotdl command, passing each line it prints to on_output as it arrives
+        Works like subprocess.run(check=True) with stderr merged into stdout, raising
+        CalledProcessError on failure (including when cancelled or stuck)
+        """
+        proc = subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            errors="replace",
+            bufsize=1, # Line buffered
+            stdin=subprocess.DEVNULL, # spotdl never reads input, no pipe to set up
+            close_fds=True, # The GUI's descriptors (display socket, watchers) stay with the GUI
+            start_new_session=True # A Ctrl-C in the terminal is for us, stopping spotdl goes through __stop_process
+        )
+        with self.__procs_lock:
+            self.__procs.add(proc)
+            
+        lines = []
+        last_output = [time.monotonic()]
+        
+        def read_output():
+            for line in proc.stdout:
+                lines.append(line)
+                last_output[0] = time.monotonic()
+                if on_output:
+                    try:
+                        on_output(line.rstrip())
+                    except Exception:
+                        pass # Keep draining the pipe so spotdl never blocks on a full buffer
+        
+        reader = threading.Thread(target=read_output, daemon=True)
+        reader.start()
+        
+        try:
+            while True:
+                try:
+                    proc.wait(timeout=0.5)
+                    break
+                except subprocess.TimeoutExpired:
+                    pass
+                
+                if cancel_event is not None and cancel_event.is_set():
+                    self.log_errors(f"Download cancelled: {command[2]}")
+                elif idle_timeout and time.monotonic() - last_output[0] > idle_timeout:
+                    self.log_errors(f"spotdl printed nothing for {idle_timeout}s, stopping it: {command[2]}")
+                else:
+                    continue
+                self.__stop_process(proc)
+                break
+        finally:
+            with self.__procs_lock:
+                self.__procs.discard(proc)
+                
+        reader.join(timeout=5)
+        output = "".join(lines)
+        if proc.returncode != 0:
+            raise subprocess.CalledProcessError(proc.returncode, command, output=output, stderr=output)
+        return subprocess.CompletedProcess(command, proc.returncode, output, "")
+        
+    def run_download(self, url: str, output_dir: Path, additional_args=None,
+                     on_output=None, cancel_event=None, idle_timeout=DOWNLOAD_IDLE_TIMEOUT, argv=None):
+        """
+        Method to run Spotdl's download command
+        
+        Args:
+        argv - Command from build_argv(), built from the other arguments when not given
+        on_output - Called with each line spotdl prints while it runs
+        cancel_event - threading.Event, setting it stops spotdl early
+        idle_timeout - Seconds without any output before spotdl is stopped as stuck
+        """
+        command = argv if argv is not None else self.build_argv(url, output_dir, additional_args)
+            
+        try:
+            return self.__run_streamed(command, on_output, cancel_event, idle_timeout)
         
         except subprocess.CalledProcessError as e:
             stderr = e.stderr or ""
@@ -196,6 +375,21 @@ class Downloader:
             self.log_errors(f"Command failed for {url}: {e}")
             return e
             
+    def save_metadata(self, url: str, save_file: Path, cancel_event=None):
+        """
+        Resolve a url's metadata once with spotdl save (no audio is downloaded)
+        The save file can then be passed to run_download in place of the url
+        cancel_event - threading.Event, setting it stops spotdl early
+        """
+        try:
+            self.__run_streamed([self.get_client(), "save", url, "--save-file", str(save_file)],
+                                cancel_event=cancel_event, idle_timeout=DOWNLOAD_IDLE_TIMEOUT)
+            return Path(save_file).exists()
+        except (subprocess.CalledProcessError, OSError) as e:
+            if not (cancel_event and cancel_event.is_set()):
+                self.log_errors(f"Could not save metadata for {url}: {e}")
+            return False
+            
     def get_user_preferences(self):
         """
         Takes in user input for the download settings
@@ -252,6 +446,7 @@ class Downloader:
             self.__output_dir = Path("Albums")
             
         self.__output_dir.mkdir(parents=True, exist_ok=True)
+        self.__rebuild_base_argv()
                     
     """ Download functions"""
     def download_track(self):
@@ -381,7 +576,7 @@ class Downloader:
         
         try:
             with open(filepath, 'r') as file:
-                file_lines = [line.rstrip() for line in file if line.strip()]
+                file_lines = [s for s in (line.strip() for line in file) if s] # Strip once per line
         except FileNotFoundError:
             self.log_errors(f" File not found: {filepath}")
             return False
@@ -506,33 +701,26 @@ class Downloader:
                 self.log_failure(f"Failed to download after {MAX_RETRIES} attempts: {song_query}")
                 return False   
 
-    def download_user_playlist(self):
+    def download_user_playlist(self, on_output=None, cancel_event=None, interactive=True):
         """
         Download a user's playlist (requires authentication)
+        on_output - Called with each line spotdl prints (printed when not given)
+        cancel_event - threading.Event, setting it stops spotdl early
+        interactive - False skips the settings prompts and uses what configure() set
         """
         print("\n=== User Playlist Download ===")
         print("Note: This requires Spotify authentication")
         print("This requires a Spotify Account")
         print("You will be redirected to the Spotify website for authorization")
         
-        self.get_user_preferences()
+        if interactive:
+            self.get_user_preferences()
         
         try:
             print("Downloading user's playlist...")
-            result = subprocess.run([
-                "spotdl",
-                "download",
-                "all-user-playlists",
-                "--user-auth",
-                "output", str(self.__output_dir),
-                "overwrite", "skip",
-                "--bitrate", self.__bitrate,
-                "--format", self.__audio_format,
-            ],
-                stdout=sys.stdout,
-                stderr=subprocess.PIPE,
-                text=True
-            )
+            result = self.__run_user_download("all-user-playlists", on_output, cancel_event)
+            if cancel_event is not None and cancel_event.is_set():
+                return False # Cancelled, spotdl has been stopped
             stderr = result.stderr or ""
             
             # Error handling for specific errors during download process
@@ -567,34 +755,27 @@ class Downloader:
             console_logger.info(f"Unexpected exception: {e}") 
             return False
         
-    def download_user_liked_songs(self):
+    def download_user_liked_songs(self, on_output=None, cancel_event=None, interactive=True):
         """
         Download a user's playlist
+        on_output - Called with each line spotdl prints (printed when not given)
+        cancel_event - threading.Event, setting it stops spotdl early
+        interactive - False skips the settings prompts and uses what configure() set
         """
         print("\n=== User Playlist Download ===")
         print("Note: This requires Spotify authentication")
         print("This requires a Spotify Account")
         print("You will be redirected to the Spotify website for authorization")
         
-        self.get_user_preferences()
+        if interactive:
+            self.get_user_preferences()
         
         try:
             print("Downloading the User's playlist")
             print("You will be redirected to the Spotify site")
-            result = subprocess.run([
-                "spotdl",
-                "download",
-                "saved",
-                "--user-auth",
-                "--output", str(self.__output_dir),
-                "--overwrite", "skip",
-                "--bitrate", self.__bitrate,
-                "--format", self.__audio_format,
-            ],
-                stdout=sys.stdout,
-                stderr=subprocess.PIPE,
-                text=True
-            )
+            result = self.__run_user_download("saved", on_output, cancel_event)
+            if cancel_event is not None and cancel_event.is_set():
+                return False # Cancelled, spotdl has been stopped
             stderr = result.stderr or ""
             
             # Error handling for specific errors during download process
@@ -629,34 +810,27 @@ class Downloader:
             console_logger.info(f"Unexpected exception: {e}") 
             return False
 
-    def download_user_saved_albums(self):
+    def download_user_saved_albums(self, on_output=None, cancel_event=None, interactive=True):
         """
         Download a user's saved albums
+        on_output - Called with each line spotdl prints (printed when not given)
+        cancel_event - threading.Event, setting it stops spotdl early
+        interactive - False skips the settings prompts and uses what configure() set
         """
         print("\n=== User Playlist Download ===")
         print("Note: This requires Spotify authentication")
         print("This requires a Spotify Account")
         print("You will be redirected to the Spotify website for authorization")
         
-        self.get_user_preferences()
+        if interactive:
+            self.get_user_preferences()
            
         try:
             print("Downloading the User's playlist")
             print("You will be redirected to the Spotify site")
-            result = subprocess.run([
-                "spotdl",
-                "download",
-                "all-user-saved-albums",
-                "--user-auth",
-                "--output", str(self.__output_dir),
-                "--overwrite", "skip",
-                "--bitrate", self.__bitrate,
-                "--format", self.__audio_format,
-            ],
-                stdout=sys.stdout,
-                stderr=subprocess.PIPE,
-                text=True
-            )
+            result = self.__run_user_download("all-user-saved-albums", on_output, cancel_event)
+            if cancel_event is not None and cancel_event.is_set():
+                return False # Cancelled, spotdl has been stopped
             stderr = result.stderr or ""
             
             # Error handling for specific errors during download process
@@ -692,9 +866,10 @@ class Downloader:
             return False
 
     @staticmethod
-    def check_spotdl(self):
+    def check_spotdl(install=True):
         """
         Check if spotdl is installed and install it if not
+        install - False only checks, for callers that ask before installing (e.g. the GUI)
         """
         if shutil.which("spotdl"):
             console_logger.info("spotdl is already installed")
@@ -714,11 +889,15 @@ class Downloader:
             except subprocess.CalledProcessError:
                 console_logger.warning("Could not determine spotdl version")
                 return True
+        elif not install:
+            console_logger.warning("spotdl not found")
+            return False
         else:
             console_logger.warning("spotdl not found. Installing...")
             
             try:
                 subprocess.check_call([sys.executable, "-m", "pip", "install", "spotdl"])
+                _spotdl_executable.cache_clear() # Pick up the newly installed executable
                 console_logger.info("spotdl installed successfully")
                 return True
             except subprocess.CalledProcessError as e:
@@ -726,7 +905,7 @@ class Downloader:
                 return False
     
     @staticmethod     
-    def show_spotdl_help(self):
+    def show_spotdl_help():
         """
         Display spotdl help
         """
@@ -772,6 +951,180 @@ class Downloader:
         print("* show_spotdl_help - Provides context on spotdl commands")
         print("="*80)
 
+""" =========================================== Metadata Cache =========================================== """
+SPOTIFY_URL_PATTERN = re.compile(
+    r"(?:open\.spotify\.com/(?:intl-[\w-]+/)?(?:user/[^/]+/)?|spotify:(?:user:[^:]+:)?)(track|album|playlist|artist)[/:]([A-Za-z0-9]+)")
+
+@functools.lru_cache(maxsize=4096)
+def spotify_id(url: str):
+    """ Normalize a Spotify url/uri to 'type_id' (None for anything else, e.g. search queries)"""
+    match = SPOTIFY_URL_PATTERN.search(url)
+    return f"{match.group(1)}_{match.group(2)}" if match else None
+
+class MetadataCache:
+    """
+    Keeps the metadata spotdl resolves for a track url (a .spotdl save file) keyed by Spotify ID
+    Retries and repeated urls download from the save file instead of hitting the Spotify API again,
+    a url's first download doesn't save one
+    Playlists, albums and artists gain songs, so they're never cached and always resolved fresh
+    The index is opened on first use, if it can't be (e.g. another window holds it) caching is just off
+    """
+    def __init__(self, downloader: Downloader, cache_dir=METADATA_CACHE_DIR, ttl=METADATA_CACHE_TTL):
+        self.downloader = downloader
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.__lock = threading.Lock() # shelve isn't safe to share between threads
+        self.__index = None # Spotify ID -> time saved, see __open_index
+        self.__disabled = False # Closed, or the index couldn't be opened
+        self.__seen = set() # Spotify IDs asked for this session
+        
+    def __open_index(self):
+        """ The shelf, opened on first use (call with the lock held), None when caching is off"""
+        if self.__index is None and not self.__disabled:
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                self.__index = shelve.open(str(self.cache_dir / "index"))
+            except (OSError, *dbm.error) as e:
+                self.__disabled = True
+                self.downloader.log_errors(f"Metadata cache unavailable, downloading without it: {e}")
+        return self.__index
+        
+    def get(self, url: str, cancel_event=None, save=False):
+        """
+        Return what to hand spotdl for this url: the cached save file when fresh, otherwise the url.
+        A save costs its own spotdl process and Spotify lookup, so it's only done when it'll be
+        reused: for a url asked for before, or when save is set (e.g. before a retry)
+        cancel_event - threading.Event, setting it stops the spotdl save early
+        """
+        key = spotify_id(url)
+        if key is None or not key.startswith("track_"):
+            return url
+        with self.__lock:
+            repeated = key in self.__seen
+            self.__seen.add(key)
+        
+        save_file = self.cache_dir / f"{key}.spotdl"
+        try:
+            with self.__lock:
+                index = self.__open_index()
+                if index is None:
+                    return url
+                saved_at = index.get(key)
+        except dbm.error:
+            return url
+            
+        if saved_at and time.time() - saved_at < self.ttl and save_file.exists():
+            return str(save_file)
+        if not (save or repeated):
+            return url
+        
+        # Saved under a name of its own and moved into place, so workers saving the same track don't mix files
+        temp_file = self.cache_dir / f"{key}.{os.getpid()}-{threading.get_ident()}.spotdl"
+        try:
+            if not self.downloader.save_metadata(url, temp_file, cancel_event):
+                return url
+            os.replace(temp_file, save_file)
+        except OSError:
+            return url
+        finally:
+            temp_file.unlink(missing_ok=True)
+        try:
+            with self.__lock:
+                if self.__index is not None:
+                    self.__index[key] = time.time()
+        except dbm.error:
+            pass # The save file is still good for this download
+        return str(save_file)
+    
+    def close(self):
+        """ Safe to call while workers are still using the cache, they fall back to the url"""
+        with self.__lock:
+            self.__disabled = True
+            if self.__index is not None:
+                self.__index.close()
+                self.__index = None
+
+class ResponseCache:
+    """
+    Remembers how each batch url ended, in a SQLite file keyed by SHA256 of the url, audio settings and output directory
+    Re-running a batch skips urls that already downloaded or failed in a way retrying won't fix
+    Only single tracks are remembered, playlists, albums and artists change and are always downloaded again
+    Modes: enabled (read and record), replay (only read, never download), disabled
+    """
+    MODES = ("disabled", "enabled", "replay")
+    
+    def __init__(self, path, mode="disabled", ttl=RESULT_CACHE_TTL):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown cache mode: {mode}")
+        self.mode = mode
+        self.ttl = ttl
+        self.__lock = threading.Lock()
+        self.__db = None
+        if mode != "disabled":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self.__db = sqlite3.connect(str(path), check_same_thread=False)
+            self.__db.execute(
+                "CREATE TABLE IF NOT EXISTS results "
+                "(key TEXT PRIMARY KEY, url TEXT, result_path TEXT, returncode INT, timestamp REAL)"
+            )
+            self.__db.commit()
+    
+    @staticmethod
+    def cacheable(url: str):
+        """ Whether a url's result can be remembered, only tracks can't gain new songs"""
+        key = spotify_id(url)
+        return key is not None and key.startswith("track_")
+    
+    @staticmethod
+    def key(url: str, bitrate: str, audio_format: str, output_dir):
+        # A download into another directory hasn't happened yet, so it gets its own entry
+        output_dir = os.path.abspath(os.fspath(output_dir))
+        return hashlib.sha256(f"{url}|{bitrate}|{audio_format}|{output_dir}".encode()).hexdigest()
+    
+    def lookup(self, key: str):
+        """
+        The cached returncode for a key, or None when not cached (or older than the ttl)
+        A cached success only says spotdl finished, spotdl doesn't report the file it wrote,
+        so it isn't checked for and a deleted track stays skipped until the entry expires or is cleared
+        """
+        if self.__db is None:
+            return None
+        with self.__lock:
+            row = self.__db.execute(
+                "SELECT returncode, timestamp FROM results WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        returncode, timestamp = row
+        if time.time() - timestamp > self.ttl:
+            return None
+        return returncode
+    
+    def store(self, key: str, url: str, result_path, returncode: int):
+        """ Record how a url ended, only in enabled mode and only for cacheable urls"""
+        if self.mode != "enabled" or not self.cacheable(url):
+            return
+        with self.__lock:
+            self.__db.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                (key, url, str(result_path), returncode, time.time())
+            )
+            self.__db.commit()
+    
+    def clear(self):
+        """ Forget every recorded result"""
+        if self.__db is None:
+            return
+        with self.__lock:
+            self.__db.execute("DELETE FROM results")
+            self.__db.commit()
+    
+    def close(self):
+        if self.__db is not None:
+            with self.__lock:
+                self.__db.close()
+                self.__db = None
+
 """ The downloader """
 def display_menu() -> None:
     """Display the main menu."""